@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the Live News Video Hub backend
+Usage: python benchmarks.py <benchmark> [options]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from fixture_data import CATEGORIES, WORDS, VOCABULARY, build_youtube_feed, seed_videos
+
+def use_benchmark_database(videos: int) -> str:
+    """Point DATABASE_URL at a fresh SQLite file seeded with synthetic videos.
+
+    Must run before anything imports database.py.
+    """
+    path = os.path.join(tempfile.mkdtemp(prefix="livenews-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+    from database import engine
+
+    start = time.perf_counter()
+    seed_videos(engine, videos)
+    print(f"Seeded {videos} videos in {time.perf_counter() - start:.1f}s ({path})")
+    return path
+
+def benchmark_feed_parsing(args):
+    """Compare feedparser against the streaming lxml fast path"""
+    from feed_parser import parse_with_feedparser, parse_with_lxml
+
+    content = build_youtube_feed(args.entries)
+    slow = parse_with_feedparser(content)
+    fast = parse_with_lxml(content)
+    mismatched = [
+        field for field in ('link', 'video_id', 'title', 'published', 'description', 'duration')
+        if [entry[field] for entry in slow] != [entry[field] for entry in fast]
+    ]
+    print(f"Feed size: {len(content) / 1024:.1f} KiB, {args.entries} entries")
+    print(f"Parsers agree on all fields: {not mismatched}" + (f" (differ on {mismatched})" if mismatched else ""))
+
+    for name, parse in (("feedparser", parse_with_feedparser), ("lxml", parse_with_lxml)):
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            parse(content)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>10}: {elapsed / args.iterations * 1000:.2f} ms/feed, {args.iterations / elapsed:.0f} feeds/s")
+
+async def _measure_requests(client, paths, concurrency: int) -> float:
+    """Issue every request with at most `concurrency` in flight; returns requests/s"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(path):
+        async with semaphore:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(path) for path in paths))
+    return len(paths) / (time.perf_counter() - start)
+
+async def _wait_for_server(client, attempts: int = 100):
+    for _ in range(attempts):
+        try:
+            await client.get("/")
+            return
+        except Exception:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("API server did not start")
+
+def _start_api_server(db_path: str, port: int, **env):
+    """Run main:app under uvicorn against db_path with extra environment variables"""
+    import subprocess
+    import sys
+
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env={
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{db_path}",
+            # The caller holds this lock so the servers never start polling feeds
+            "INGESTION_LOCK_FILE": os.path.join(os.path.dirname(db_path), "ingestion.lock"),
+            **env
+        },
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+def _hold_ingestion_lock(db_path: str):
+    """Take the ingestion lock and migrate, so servers start serving straight away"""
+    from database import engine
+    from leader_election import LeaderLock
+    from migrations import run_migrations
+
+    run_migrations(engine)
+    lock = LeaderLock(os.path.join(os.path.dirname(db_path), "ingestion.lock"))
+    lock.try_acquire()
+    return lock
+
+async def benchmark_api_throughput(args):
+    """Concurrent list/search throughput with DB calls inline vs in the DB thread pool"""
+    import httpx
+
+    db_path = use_benchmark_database(args.videos)
+    lock = _hold_ingestion_lock(db_path)
+
+    rng = random.Random(7)
+    paths = []
+    for _ in range(args.iterations):
+        paths.append(f"/api/videos?category={rng.choice(CATEGORIES)}&limit=20")
+        paths.append(f"/api/search?q={rng.choice(WORDS)}&limit=20")
+
+    port = 8765
+    for label, threads in (("inline (before)", "0"), ("8 DB threads (after)", "8")):
+        # Measures the thread pool alone, not the response cache
+        server = _start_api_server(db_path, port, DB_THREADS=threads, RESPONSE_CACHE_ENABLED="false")
+        try:
+            limits = httpx.Limits(max_connections=args.concurrency + 1)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+                await _wait_for_server(client)
+
+                # Probe a DB-free endpoint during the load to see how long the loop stalls
+                probe_latencies = []
+                load = asyncio.ensure_future(_measure_requests(client, paths, args.concurrency))
+                while not load.done():
+                    probe_start = time.perf_counter()
+                    await client.get("/")
+                    probe_latencies.append(time.perf_counter() - probe_start)
+                    await asyncio.sleep(0.01)
+                rate = load.result()
+                probe_latencies.sort()
+                p95 = probe_latencies[int(len(probe_latencies) * 0.95)] * 1000
+                print(
+                    f"{label:>22}: {rate:.1f} req/s ({len(paths)} requests, concurrency {args.concurrency}), "
+                    f"health check p95 {p95:.0f} ms"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+    lock.release()
+
+async def benchmark_response_cache(args):
+    """Home page and category tab traffic with the response cache off and on"""
+    import httpx
+
+    db_path = use_benchmark_database(args.videos)
+    lock = _hold_ingestion_lock(db_path)
+
+    # Every client opens the same few first pages
+    rng = random.Random(11)
+    pages = ["/api/videos?limit=20&offset=0"] + [
+        f"/api/videos?category={category}&limit=20&offset=0" for category in CATEGORIES
+    ]
+    paths = [rng.choice(pages) for _ in range(args.iterations * 2)]
+
+    port = 8766
+    for label, enabled in (("cache off (before)", "false"), ("cache on (after)", "true")):
+        server = _start_api_server(db_path, port, RESPONSE_CACHE_ENABLED=enabled)
+        try:
+            limits = httpx.Limits(max_connections=args.concurrency + 1)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+                await _wait_for_server(client)
+                rate = await _measure_requests(client, paths, args.concurrency)
+                stats = (await client.get("/api/stats/cache")).json()["data"]
+                print(
+                    f"{label:>18}: {rate:.1f} req/s ({len(paths)} requests, concurrency {args.concurrency}), "
+                    f"hit rate {stats['hitRate']}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+    lock.release()
+
+def benchmark_search(args):
+    """Search latency through the FTS5 index vs the ILIKE scan it replaced"""
+    import statistics
+    use_benchmark_database(args.videos)
+
+    from database import SessionLocal, engine
+    from migrations import run_migrations
+    import video_queries
+
+    start = time.perf_counter()
+    run_migrations(engine)
+    print(f"Built search index in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(11)
+    mid = VOCABULARY[len(WORDS):2000]
+    rare = VOCABULARY[2000:]
+    workloads = {
+        "common word": [rng.choice(WORDS) for _ in range(args.iterations)],
+        "mid word": [rng.choice(mid) for _ in range(args.iterations)],
+        "rare word": [rng.choice(rare) for _ in range(args.iterations)],
+        "two words": [f"{rng.choice(WORDS)} {rng.choice(mid)}" for _ in range(args.iterations)],
+        "prefix": [rng.choice(mid)[:4] for _ in range(args.iterations)],
+    }
+
+    db = SessionLocal()
+    for workload, queries in workloads.items():
+        for label, full_text in (("ILIKE (before)", False), ("FTS5 (after)", True)):
+            video_queries.FULL_TEXT_SEARCH = full_text
+            # A miss makes ILIKE scan the whole table; a few samples are enough
+            sample = queries if full_text else queries[:5]
+            latencies = []
+            for q in sample:
+                query_start = time.perf_counter()
+                video_queries.search_videos_query(db, q).limit(20).all()
+                latencies.append(time.perf_counter() - query_start)
+            latencies.sort()
+            print(
+                f"{workload:>11} {label:>15}: median {statistics.median(latencies) * 1000:8.1f} ms, "
+                f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:8.1f} ms over {len(sample)} queries"
+            )
+    db.close()
+
+def benchmark_pagination(args):
+    """Deep /api/videos pages: count + OFFSET vs a keyset cursor"""
+    use_benchmark_database(args.videos)
+
+    from database import SessionLocal, engine
+    from migrations import run_migrations
+    from video_queries import video_list_query, keyset_position, after_position, decode_cursor, encode_cursor
+
+    run_migrations(engine)
+    db = SessionLocal()
+    limit = 20
+    for depth in (0, args.videos // 10, args.videos // 2, args.videos - limit):
+        # The cursor a client would hold after paging down to this depth
+        anchor = video_list_query(db).offset(depth - 1).first() if depth else None
+        position = decode_cursor(encode_cursor(keyset_position(anchor))) if anchor else None
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            video_list_query(db, category="all").order_by(None).count()
+        count_ms = (time.perf_counter() - start) / args.iterations * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            video_list_query(db, category="all").offset(depth).limit(limit + 1).all()
+        offset_ms = (time.perf_counter() - start) / args.iterations * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            query = video_list_query(db, category="all")
+            if position:
+                query = after_position(query, position)
+            query.limit(limit + 1).all()
+        cursor_ms = (time.perf_counter() - start) / args.iterations * 1000
+        print(
+            f"depth {depth:>8}: count {count_ms:7.2f} ms + offset {offset_ms:7.2f} ms/page, "
+            f"cursor {cursor_ms:5.2f} ms/page"
+        )
+    db.close()
+
+def benchmark_payload(args):
+    """/api/videos page bytes and rows/s: full rows vs the lean list fields vs a card-only fieldset"""
+    use_benchmark_database(args.videos)
+
+    import json
+    from sqlalchemy.orm import undefer
+    from database import SessionLocal, engine
+    from migrations import run_migrations
+    from models import Video
+    from video_fields import ALL_FIELDS, LIST_FIELDS, load_fields, parse_fields, video_to_dict
+    from video_queries import video_list_query
+
+    run_migrations(engine)
+    db = SessionLocal()
+    limit = 100
+    variants = {
+        "full (before)": (ALL_FIELDS, lambda query: query.options(undefer(Video.description))),
+        "lean default": (LIST_FIELDS, lambda query: load_fields(query, LIST_FIELDS)),
+    }
+    card_fields = parse_fields("title,thumbnail,channel,published,isLive,duration")
+    variants["?fields=card"] = (card_fields, lambda query: load_fields(query, card_fields))
+
+    baseline = None
+    for name, (fields, shape) in variants.items():
+        rows = 0
+        page_bytes = 0
+        start = time.perf_counter()
+        for i in range(args.iterations):
+            query = shape(video_list_query(db, category=CATEGORIES[i % len(CATEGORIES)]))
+            videos = query.offset((i * limit) % (args.videos // len(CATEGORIES))).limit(limit).all()
+            body = json.dumps({"success": True, "data": [video_to_dict(video, fields) for video in videos]})
+            rows += len(videos)
+            page_bytes += len(body.encode())
+            db.expunge_all()
+        elapsed = time.perf_counter() - start
+        per_page = page_bytes / args.iterations
+        baseline = baseline or per_page
+        print(
+            f"{name:<14} {per_page / 1024:7.1f} KiB/page ({per_page / baseline:4.0%}), "
+            f"{rows / elapsed:9,.0f} rows/s"
+        )
+    db.close()
+
+def benchmark_serialization(args):
+    """Encoding a 100-video page: jsonable_encoder + json vs orjson vs cached fragments"""
+    use_benchmark_database(args.videos)
+
+    import json
+    from fastapi.encoders import jsonable_encoder
+    from database import SessionLocal, engine
+    from json_response import ORJSON_AVAILABLE, join_array, with_members
+    from migrations import run_migrations
+    from video_fields import LIST_FIELDS, VideoFragmentCache, load_fields, video_to_dict
+    from video_queries import video_list_query
+
+    run_migrations(engine)
+    db = SessionLocal()
+    videos = load_fields(video_list_query(db), LIST_FIELDS).limit(100).all()
+    db.close()
+
+    def before():
+        # What returning the dict cost: FastAPI's encoder pass, then JSONResponse.render
+        content = jsonable_encoder({"success": True, "data": [video_to_dict(video, LIST_FIELDS) for video in videos]})
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+    def fragments(cache):
+        return with_members(b'{"success":true}', {
+            "data": join_array(cache.encode(video, LIST_FIELDS) for video in videos)
+        })
+
+    warm = VideoFragmentCache()
+    cases = {
+        "jsonable_encoder + json (before)": before,
+        f"{'orjson' if ORJSON_AVAILABLE else 'json'}, cold fragments": lambda: fragments(VideoFragmentCache()),
+        "cached fragments": lambda: fragments(warm),
+    }
+    assert json.loads(before()) == json.loads(fragments(warm))
+    for name, encode in cases.items():
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            encode()
+        page_us = (time.perf_counter() - start) / args.iterations * 1_000_000
+        print(f"{name:<34} {page_us:8.1f} µs per 100-video page")
+
+def benchmark_hot_index(args):
+    """First pages from SQLite vs the in-memory hot index, and memory per entry"""
+    use_benchmark_database(args.videos)
+
+    import sys
+    from database import SessionLocal, engine
+    from hot_index import HOT_COLUMNS, HotIndex, hot_video_bytes
+    from migrations import run_migrations
+    from video_fields import LIST_FIELDS, load_fields
+    from video_queries import video_list_query, maintained_total
+
+    run_migrations(engine)
+    index = HotIndex(enabled=True)
+    index.seed()
+    versions = {}
+    db = SessionLocal()
+    limit = 21
+    for label, category in (("all", None), ("category", "technology")):
+        name = f"category:{category}" if category else "all"
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            maintained_total(db, category=category)
+            load_fields(video_list_query(db, category=category), LIST_FIELDS).limit(limit).all()
+        db_ms = (time.perf_counter() - start) / args.iterations * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            index.page(name, versions, limit)
+        hot_ms = (time.perf_counter() - start) / args.iterations * 1000
+        print(f"first page ({label:<8}): SQLite {db_ms:6.3f} ms, hot index {hot_ms:6.4f} ms")
+    db.close()
+
+    # The same entry as a slots record and as a plain dict of the same values
+    entry = next(iter(index._buffers["all"].videos))
+    as_dict = {name: getattr(entry, name) for name in HOT_COLUMNS}
+    values = hot_video_bytes(entry) - sys.getsizeof(entry)
+    stats = index.get_stats()
+    print(
+        f"memory per entry: {hot_video_bytes(entry)} bytes with __slots__ "
+        f"({sys.getsizeof(entry)} object + {values} values), {sys.getsizeof(as_dict) + values} bytes as a dict; "
+        f"{stats['entries']} entries in {stats['buffers']} buffers = {stats['bytes'] / 1024 / 1024:.1f} MiB"
+    )
+
+BENCHMARKS = {
+    "feed-parsing": benchmark_feed_parsing,
+    "api-throughput": benchmark_api_throughput,
+    "search": benchmark_search,
+    "pagination": benchmark_pagination,
+    "payload": benchmark_payload,
+    "response-cache": benchmark_response_cache,
+    "serialization": benchmark_serialization,
+    "hot-index": benchmark_hot_index,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=15)
+    parser.add_argument("--videos", type=int, default=50000, help="synthetic videos to seed")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    result = BENCHMARKS[args.benchmark](args)
+    if asyncio.iscoroutine(result):
+        asyncio.run(result)
+
+if __name__ == "__main__":
+    main()
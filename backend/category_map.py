@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from database import SessionLocal
+from models import Category, DatasetVersion, category_channels
+from video_store import get_dialect_insert
+
+# Other processes' writes are picked up after this many seconds at most
+CATEGORY_MAP_TTL = float(os.getenv("CATEGORY_MAP_TTL", "300"))
+
+class CategoryChannelMap:
+    """Cached categories with their channel IDs, served by /api/categories.
+
+    Writers in this process call invalidate() after committing; the TTL bounds
+    how stale the map can be when another process wrote. version is the
+    "catalog" dataset version the map was read at.
+    """
+
+    def __init__(self, ttl: float = CATEGORY_MAP_TTL):
+        self.ttl = ttl
+        self._categories: Optional[List[Dict]] = None
+        self._loaded_at = 0.0
+        self.version = 0
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def cached(self, min_version: int = 0) -> Optional[List[Dict]]:
+        """The cached categories if still fresh and read at min_version or later, without touching the database"""
+        if (
+            self._categories is not None
+            and self.version >= min_version
+            and time.monotonic() - self._loaded_at < self.ttl
+        ):
+            return self._categories
+        return None
+
+    def load(self, min_version: int = 0) -> List[Dict]:
+        """Categories as [{"id", "name", "color", "channels"}], querying only when stale"""
+        categories = self.cached(min_version)
+        if categories is not None:
+            return categories
+
+        with self._lock:
+            categories = self.cached(min_version)
+            if categories is not None:
+                return categories
+
+            db = SessionLocal()
+            try:
+                # Read in the same transaction as the rows it versions
+                version = db.query(DatasetVersion.version).filter(DatasetVersion.name == "catalog").scalar() or 0
+                rows = db.execute(
+                    select(Category.id, Category.name, Category.color, category_channels.c.channel_id)
+                    .outerjoin(category_channels, category_channels.c.category_id == Category.id)
+                    .order_by(Category.id, category_channels.c.channel_id)
+                )
+                by_id: Dict[str, Dict] = {}
+                for category_id, name, color, channel_id in rows:
+                    category = by_id.setdefault(category_id, {
+                        "id": category_id, "name": name, "color": color, "channels": []
+                    })
+                    if channel_id is not None:
+                        category["channels"].append(channel_id)
+            finally:
+                db.close()
+
+            self._categories = list(by_id.values())
+            self.version = version
+            self._loaded_at = time.monotonic()
+            self.loads += 1
+            return self._categories
+
+    def invalidate(self):
+        """Drop the cached map; the next load queries the database"""
+        self._categories = None
+
+def link_channels(db, links: Iterable[Tuple[str, str]]):
+    """Add (category_id, channel_id) links that don't exist yet, in the caller's
+    transaction. Call category_channel_map.invalidate() after committing.
+    """
+    rows = [{"category_id": category_id, "channel_id": channel_id} for category_id, channel_id in links]
+    if not rows:
+        return
+
+    dialect_insert = get_dialect_insert()
+    if dialect_insert is not None:
+        db.execute(dialect_insert(category_channels).values(rows).on_conflict_do_nothing())
+        return
+
+    existing = set(db.execute(select(category_channels.c.category_id, category_channels.c.channel_id)).tuples())
+    missing = [row for row in rows if (row["category_id"], row["channel_id"]) not in existing]
+    if missing:
+        db.execute(category_channels.insert(), missing)
+
+category_channel_map = CategoryChannelMap()
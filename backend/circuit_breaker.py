@@ -0,0 +1,134 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class CircuitBreaker:
+    """Per-channel health state machine: closed -> open -> half-open.
+
+    After failure_threshold consecutive failures a channel's circuit opens and
+    it is skipped for an exponentially growing, jittered backoff (or for as long
+    as a 429 Retry-After asks). Once that expires one trial request is let
+    through: success closes the circuit, failure opens it again for longer.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_backoff: float = 60,
+        max_backoff: float = 3600
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._channels: Dict[str, Dict] = {}
+
+    def _state(self, channel_id: str) -> Dict:
+        if channel_id not in self._channels:
+            self._channels[channel_id] = {
+                'state': CLOSED,
+                'consecutive_failures': 0,
+                'opened_count': 0,
+                'open_until': 0.0,
+                'successes': 0,
+                'failures': 0,
+                'skipped': 0,
+                'last_error': None,
+                'last_failure_at': None
+            }
+        return self._channels[channel_id]
+
+    def allow_request(self, channel_id: str, now: Optional[float] = None) -> bool:
+        """Whether a channel may be fetched now; counts a skip if not"""
+        state = self._state(channel_id)
+        now = time.monotonic() if now is None else now
+
+        if state['state'] == OPEN and now >= state['open_until']:
+            state['state'] = HALF_OPEN
+            return True
+        if state['state'] == CLOSED:
+            return True
+
+        # Open, or half-open with its trial request already in flight
+        state['skipped'] += 1
+        return False
+
+    def record_success(self, channel_id: str):
+        state = self._state(channel_id)
+        state['state'] = CLOSED
+        state['consecutive_failures'] = 0
+        state['opened_count'] = 0
+        state['successes'] += 1
+
+    def record_failure(
+        self,
+        channel_id: str,
+        error: str = "",
+        retry_after: Optional[float] = None,
+        now: Optional[float] = None
+    ):
+        """Record a failed fetch, opening the circuit when warranted.
+
+        A retry_after (from a 429 response) opens the circuit immediately for at
+        least that long.
+        """
+        state = self._state(channel_id)
+        now = time.monotonic() if now is None else now
+        state['consecutive_failures'] += 1
+        state['failures'] += 1
+        state['last_error'] = error
+        state['last_failure_at'] = datetime.utcnow().isoformat()
+
+        if (
+            state['state'] == HALF_OPEN
+            or retry_after is not None
+            or state['consecutive_failures'] >= self.failure_threshold
+        ):
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** state['opened_count'])
+            # Equal jitter keeps broken channels from retrying in lockstep
+            backoff = backoff / 2 + random.uniform(0, backoff / 2)
+            if retry_after is not None:
+                backoff = max(backoff, retry_after)
+            state['state'] = OPEN
+            state['opened_count'] += 1
+            state['open_until'] = now + backoff
+
+    def get_state(self, channel_id: str) -> str:
+        return self._state(channel_id)['state']
+
+    def get_stats(self, now: Optional[float] = None) -> Dict:
+        """Health state and failure counts per channel"""
+        now = time.monotonic() if now is None else now
+        return {
+            channel_id: {
+                'state': state['state'],
+                'consecutiveFailures': state['consecutive_failures'],
+                'successes': state['successes'],
+                'failures': state['failures'],
+                'skipped': state['skipped'],
+                'lastError': state['last_error'],
+                'lastFailureAt': state['last_failure_at'],
+                'retryIn': round(max(0.0, state['open_until'] - now), 1) if state['state'] == OPEN else 0.0
+            }
+            for channel_id, state in self._channels.items()
+        }
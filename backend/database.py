@@ -1,19 +1,65 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 import os
 
 # Database URL - use SQLite for development
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./news_videos.db")
 
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/") == "sqlite:")
+
+# SQLite profile: "production" (WAL, tuned PRAGMAs, a pool of connections)
+# or "development" (a single shared connection with SQLite defaults)
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "production")
+# Idle connections kept open, plus extra ones opened under load. Together they
+# cover AnyIO's 40 threadpool workers and DB_THREADS all holding a session at
+# once; past that, checkouts wait for a free connection.
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "20"))
+SQLITE_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "40"))
+SQLITE_PRAGMAS = {
+    # Must precede journal_mode to take effect on a new database; lets the
+    # retention job hand freed pages back to the filesystem
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB, so 64 MiB
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),  # ms
+    "temp_store": "MEMORY",
+}
+
+def _engine_options() -> dict:
+    if not IS_SQLITE:
+        return {}
+    options = {"connect_args": {"check_same_thread": False}}
+    if IS_SQLITE_MEMORY or SQLITE_PROFILE != "production":
+        # An in-memory database only exists on its one connection
+        options["poolclass"] = StaticPool
+    else:
+        # WAL lets each checked-out connection read while the fetcher writes.
+        # Connections are handed out per session rather than pinned to threads,
+        # so no thread's connection is ever closed while its session is live.
+        options["poolclass"] = QueuePool
+        options["pool_size"] = SQLITE_POOL_SIZE
+        options["max_overflow"] = SQLITE_MAX_OVERFLOW
+    return options
+
 # Create engine
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    poolclass=StaticPool if "sqlite" in DATABASE_URL else None,
-    echo=False  # Set to True for SQL query logging
+    echo=False,  # Set to True for SQL query logging
+    **_engine_options()
 )
 
+if IS_SQLITE and not IS_SQLITE_MEMORY and SQLITE_PROFILE == "production":
+    @event.listens_for(engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
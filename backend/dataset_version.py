@@ -0,0 +1,71 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from database import SessionLocal
+from models import DatasetVersion
+
+# Workers that didn't make a change see its new version after this many seconds at most
+DATASET_VERSION_TTL = float(os.getenv("DATASET_VERSION_TTL", "2"))
+
+class DatasetVersions:
+    """Cached copy of the dataset_versions table.
+
+    Conditional requests compare against this copy, so a 304 costs at most one
+    small query per TTL. Writers in this process call invalidate() after
+    committing a bump.
+    """
+
+    def __init__(self, ttl: float = DATASET_VERSION_TTL):
+        self.ttl = ttl
+        self._versions: Optional[Dict[str, int]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def cached(self) -> Optional[Dict[str, int]]:
+        """The cached versions if still fresh, without touching the database"""
+        if self._versions is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return self._versions
+        return None
+
+    def load(self) -> Dict[str, int]:
+        """Versions as {dataset: version}, querying only when stale"""
+        versions = self.cached()
+        if versions is not None:
+            return versions
+
+        with self._lock:
+            versions = self.cached()
+            if versions is not None:
+                return versions
+
+            db = SessionLocal()
+            try:
+                versions = read_dataset_versions(db)
+            finally:
+                db.close()
+
+            self._versions = versions
+            self._loaded_at = time.monotonic()
+            self.loads += 1
+            return versions
+
+    def invalidate(self):
+        """Drop the cached versions; the next load queries the database"""
+        self._versions = None
+
+def read_dataset_versions(db) -> Dict[str, int]:
+    """Current versions from the database; datasets never bumped are absent"""
+    return dict(db.query(DatasetVersion.name, DatasetVersion.version).all())
+
+def version_of(versions: Dict[str, int], dataset: str) -> int:
+    """A dataset's version; a category never bumped since migration 7 shares the "videos" one"""
+    if dataset in versions:
+        return versions[dataset]
+    if dataset.startswith("videos:"):
+        return versions.get("videos", 0)
+    return 0
+
+dataset_versions = DatasetVersions()
@@ -0,0 +1,46 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from database import SessionLocal
+
+# Threads running blocking database work; 0 runs it inline on the event loop
+DB_THREADS = int(os.getenv("DB_THREADS", "8"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=DB_THREADS, thread_name_prefix="db")
+    return _executor
+
+async def run_in_db(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking database call in the DB thread pool"""
+    if DB_THREADS <= 0:
+        return fn(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(fn, *args, **kwargs))
+
+def _call_with_session(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+async def run_with_session(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run fn(db, *args, **kwargs) with its own session in the DB thread pool.
+
+    The session is closed before returning, so fn should return plain values or
+    fully loaded ORM objects.
+    """
+    return await run_in_db(_call_with_session, fn, *args, **kwargs)
+
+def shutdown_db_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
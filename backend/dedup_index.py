@@ -0,0 +1,91 @@
+import logging
+import sys
+from collections import OrderedDict
+from typing import Dict, Iterable
+
+from database import SessionLocal
+from models import Video
+from video_store import UPSERT_FIELDS, video_fingerprint
+
+logger = logging.getLogger(__name__)
+
+class SeenIndex:
+    """Bounded in-memory index of stored video IDs for ingestion dedup.
+
+    Maps each known ID to a fingerprint of its mutable metadata, evicting the
+    least recently seen IDs past max_entries. A video whose ID and fingerprint
+    are both known is already stored as-is and can skip the database; anything
+    else falls through to the authoritative check in upsert_videos.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, video_id: str, fingerprint: int):
+        self._entries[video_id] = fingerprint
+        self._entries.move_to_end(video_id)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def add(self, video_data: Dict):
+        self._store(video_data['id'], video_fingerprint(video_data))
+
+    def add_many(self, videos: Iterable[Dict]):
+        for video_data in videos:
+            self.add(video_data)
+
+    def is_known(self, video_data: Dict) -> bool:
+        """True if the video is already stored with identical metadata"""
+        fingerprint = self._entries.get(video_data['id'])
+        if fingerprint is not None and fingerprint == video_fingerprint(video_data):
+            self._entries.move_to_end(video_data['id'])
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def warm(self):
+        """Load the most recently published videos from the database"""
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Video.id, *(getattr(Video, field) for field in UPSERT_FIELDS))
+                .order_by(Video.published.desc())
+                .limit(self.max_entries)
+                .all()
+            )
+            # Oldest first so the newest end up most recently used
+            for row in reversed(rows):
+                self._store(row.id, video_fingerprint(row._asdict()))
+            logger.info(f"Seen-ID index warmed with {len(self._entries)} videos")
+        except Exception as e:
+            logger.error(f"Error warming seen-ID index: {e}")
+        finally:
+            db.close()
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the index (container, keys and fingerprints)"""
+        return sys.getsizeof(self._entries) + sum(
+            sys.getsizeof(video_id) + sys.getsizeof(fingerprint)
+            for video_id, fingerprint in self._entries.items()
+        )
+
+    def get_stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "memoryBytes": self.memory_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups, 3) if lookups else None
+        }
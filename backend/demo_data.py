@@ -9,6 +9,9 @@ import random
 from datetime import datetime, timedelta
 from database import SessionLocal
 from models import Video, Channel, Category
+from video_queries import facet_counts
+from dataset_version import read_dataset_versions
+from video_store import bump_dataset_versions, rebuild_video_counts, video_datasets, video_row
 
 # Sample video data for testing
 SAMPLE_VIDEOS = [
@@ -163,25 +166,32 @@ def populate_demo_data():
         db.query(Video).delete()
         print("🗑️  Cleared existing videos")
         
-        # Add sample videos
+        # Add sample videos, with the derived columns ingestion would fill
+        now = datetime.utcnow()
         for video_data in SAMPLE_VIDEOS:
-            video = Video(**video_data)
+            video = Video(**video_row(video_data, now))
             db.add(video)
+        db.flush()
         
+        # Bulk changes bypass ingestion, so recount in the same transaction
+        rebuild_video_counts(db)
+        # Every video dataset changed, including categories that are now empty
+        bump_dataset_versions(db, set(video_datasets(video['category'] for video in SAMPLE_VIDEOS)) | {
+            name for name in read_dataset_versions(db) if name.startswith("videos")
+        })
         db.commit()
         print(f"✅ Added {len(SAMPLE_VIDEOS)} sample videos to database")
         
         # Print summary
+        facets = facet_counts(db)
         print("\n📊 Demo Data Summary:")
-        print(f"Total videos: {db.query(Video).count()}")
-        print(f"Live videos: {db.query(Video).filter(Video.is_live == True).count()}")
-        print(f"Categories: {db.query(Video.category).distinct().count()}")
+        print(f"Total videos: {facets['total']}")
+        print(f"Live videos: {facets['live']['live']}")
+        print(f"Categories: {len(facets['categories'])}")
         
         # Show videos by category
-        categories = db.query(Video.category).distinct().all()
-        for category in categories:
-            count = db.query(Video).filter(Video.category == category[0]).count()
-            print(f"  - {category[0]}: {count} videos")
+        for category, count in facets["categories"].items():
+            print(f"  - {category}: {count} videos")
         
     except Exception as e:
         print(f"❌ Error populating demo data: {e}")
@@ -0,0 +1,100 @@
+import io
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import feedparser
+
+# Parser configuration
+USE_FAST_PARSER = os.getenv("RSS_FAST_PARSER", "false").lower() == "true"
+PARSER_EXECUTOR = os.getenv("RSS_PARSER_EXECUTOR", "thread")  # thread or process
+PARSER_WORKERS = int(os.getenv("RSS_PARSER_WORKERS", "2"))
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+MEDIA = "{http://search.yahoo.com/mrss/}"
+YT = "{http://www.youtube.com/xml/schemas/2015}"
+
+_executor: Optional[Executor] = None
+
+# Both parsers return the same minimal entry records:
+# {'link', 'video_id', 'title', 'published', 'description', 'duration'}
+# where published is a naive UTC datetime and duration the raw duration string.
+
+def parse_with_feedparser(content: bytes, max_entries: int = 10) -> List[Dict]:
+    """Parse a feed with feedparser (handles any RSS/Atom dialect)"""
+    feed = feedparser.parse(content)
+    entries = []
+    for entry in feed.entries[:max_entries]:
+        duration = ""
+        if hasattr(entry, 'media_content') and entry.media_content:
+            duration = entry.media_content[0].get('duration', '')
+        entries.append({
+            'link': entry.link,
+            'video_id': entry.get('yt_videoid'),
+            'title': entry.title,
+            'published': datetime(*entry.published_parsed[:6]),
+            'description': entry.get('summary', ''),
+            'duration': duration
+        })
+    return entries
+
+def _parse_timestamp(value: str) -> datetime:
+    published = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    if published.tzinfo is not None:
+        published = published.astimezone(timezone.utc).replace(tzinfo=None)
+    return published
+
+def parse_with_lxml(content: bytes, max_entries: int = 10) -> List[Dict]:
+    """Parse a YouTube Atom feed with a streaming lxml parser.
+
+    Only the fields we store are read, and parsing stops after max_entries.
+    """
+    from lxml import etree
+
+    entries = []
+    for _, element in etree.iterparse(io.BytesIO(content), events=('end',), tag=f"{ATOM}entry"):
+        link = element.find(f"{ATOM}link[@rel='alternate']")
+        if link is None:
+            link = element.find(f"{ATOM}link")
+        media_group = element.find(f"{MEDIA}group")
+        media_content = media_group.find(f"{MEDIA}content") if media_group is not None else None
+
+        entries.append({
+            'link': link.get('href') if link is not None else '',
+            'video_id': element.findtext(f"{YT}videoId"),
+            'title': element.findtext(f"{ATOM}title", default='').strip(),
+            'published': _parse_timestamp(element.findtext(f"{ATOM}published")),
+            'description': (
+                media_group.findtext(f"{MEDIA}description", default='').strip() if media_group is not None else ''
+            ),
+            'duration': media_content.get('duration', '') if media_content is not None else ''
+        })
+
+        # Free the parsed subtree as we go
+        element.clear()
+        if len(entries) >= max_entries:
+            break
+    return entries
+
+def parse_feed_entries(content: bytes, max_entries: int = 10) -> List[Dict]:
+    """Parse a feed with the configured parser"""
+    if USE_FAST_PARSER:
+        return parse_with_lxml(content, max_entries)
+    return parse_with_feedparser(content, max_entries)
+
+def get_parser_executor() -> Executor:
+    """Get the pool that runs feed parsing off the event loop"""
+    global _executor
+    if _executor is None:
+        if PARSER_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=PARSER_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=PARSER_WORKERS, thread_name_prefix="feed-parser")
+    return _executor
+
+def shutdown_parser_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
@@ -0,0 +1,111 @@
+"""
+Synthetic videos and feeds shared by the tests and benchmarks.py
+"""
+
+import random
+from datetime import datetime, timedelta
+
+CATEGORIES = ['world', 'politics', 'business', 'technology', 'sports', 'entertainment', 'health', 'science']
+WORDS = [
+    'breaking', 'election', 'market', 'climate', 'storm', 'summit', 'economy', 'vaccine',
+    'rocket', 'launch', 'championship', 'interview', 'review', 'analysis', 'protest', 'trade',
+    'energy', 'court', 'budget', 'festival', 'discovery', 'ocean', 'galaxy', 'robot'
+]
+
+def _build_vocabulary(size: int = 20000) -> list:
+    """WORDS followed by made-up words; drawn Zipf-style so WORDS are the common ones"""
+    rng = random.Random(3)
+    syllables = ['ka', 'lo', 'mi', 'ne', 'ru', 'ta', 'vi', 'zo', 'pe', 'sha', 'dor', 'lin', 'mar', 'tek']
+    vocabulary = list(WORDS)
+    seen = set(vocabulary)
+    while len(vocabulary) < size:
+        word = ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+    return vocabulary
+
+VOCABULARY = _build_vocabulary()
+_VOCABULARY_WEIGHTS = []
+for _rank in range(len(VOCABULARY)):
+    _VOCABULARY_WEIGHTS.append((_VOCABULARY_WEIGHTS[-1] if _VOCABULARY_WEIGHTS else 0) + 1 / (_rank + 1))
+
+def _random_text(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choices(VOCABULARY, cum_weights=_VOCABULARY_WEIGHTS, k=words))
+
+def seed_videos(engine, videos: int):
+    """Create the tables on engine and insert synthetic videos, newest first"""
+    from sqlalchemy import insert
+    from models import Base, Video
+    from video_time import epoch_ms, format_duration
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        for offset in range(0, videos, 5000):
+            rows = []
+            for i in range(offset, min(offset + 5000, videos)):
+                video_id = f"bench{i:08d}"
+                title = _random_text(rng, 8)
+                published = now - timedelta(seconds=i * 37)
+                duration_seconds = rng.randint(1, 3599)
+                rows.append({
+                    'id': f"yt:video:{video_id}",
+                    'title': title.capitalize(),
+                    'channel_id': f"channel{i % 40:02d}",
+                    'channel_name': f"Channel {i % 40}",
+                    'published': published,
+                    'published_ms': epoch_ms(published),
+                    'url': f"https://www.youtube.com/watch?v={video_id}",
+                    'embed_url': f"https://www.youtube.com/embed/{video_id}",
+                    'thumbnail': f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+                    'category': CATEGORIES[i % len(CATEGORIES)],
+                    'is_live': i % 50 == 0,
+                    'duration': format_duration(duration_seconds),
+                    'duration_seconds': duration_seconds,
+                    'view_count': rng.randint(0, 10 ** 6),
+                    'description': _random_text(rng, 60),
+                    'created_at': now,
+                    'updated_at': now
+                })
+            connection.execute(insert(Video), rows)
+
+def build_youtube_feed(entries: int = 15) -> bytes:
+    """Build a YouTube channel Atom feed shaped like the real ones"""
+    now = datetime.utcnow()
+    items = []
+    for i in range(entries):
+        published = (now - timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%S+00:00')
+        items.append(f"""
+ <entry>
+  <id>yt:video:video{i:06d}</id>
+  <yt:videoId>video{i:06d}</yt:videoId>
+  <yt:channelId>UC16niRr50-MSBwiO3YDb3RA</yt:channelId>
+  <title>Breaking news story number {i} with a reasonably long headline</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v=video{i:06d}"/>
+  <author>
+   <name>BBC News</name>
+   <uri>https://www.youtube.com/channel/UC16niRr50-MSBwiO3YDb3RA</uri>
+  </author>
+  <published>{published}</published>
+  <updated>{published}</updated>
+  <media:group>
+   <media:title>Breaking news story number {i} with a reasonably long headline</media:title>
+   <media:content url="https://www.youtube.com/v/video{i:06d}?version=3" type="application/x-shockwave-flash" width="640" height="390"/>
+   <media:thumbnail url="https://i4.ytimg.com/vi/video{i:06d}/hqdefault.jpg" width="480" height="360"/>
+   <media:description>{'Full coverage of the story as it develops. ' * 20}</media:description>
+   <media:community>
+    <media:starRating count="1234" average="5.00" min="1" max="5"/>
+    <media:statistics views="56789"/>
+   </media:community>
+  </media:group>
+ </entry>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+ <link rel="self" href="http://www.youtube.com/feeds/videos.xml?channel_id=UC16niRr50-MSBwiO3YDb3RA"/>
+ <id>yt:channel:16niRr50-MSBwiO3YDb3RA</id>
+ <yt:channelId>16niRr50-MSBwiO3YDb3RA</yt:channelId>
+ <title>BBC News</title>
+ <published>2006-04-08T12:00:00+00:00</published>{''.join(items)}
+</feed>""".encode()
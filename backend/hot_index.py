@@ -0,0 +1,275 @@
+import logging
+import os
+import sys
+import threading
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from database import SessionLocal
+from dataset_version import read_dataset_versions, version_of
+from models import Video, VideoCount
+from video_queries import maintained_total, video_list_query
+
+logger = logging.getLogger(__name__)
+
+HOT_INDEX_ENABLED = os.getenv("HOT_INDEX_ENABLED", "true").lower() == "true"
+# Newest videos kept per buffer; a first page is served from memory when it fits
+HOT_INDEX_SIZE = int(os.getenv("HOT_INDEX_SIZE", "200"))
+
+# Everything the list fields and keyset cursors read (no description)
+HOT_COLUMNS = (
+    "id", "title", "channel_id", "channel_name", "published", "published_ms", "url", "embed_url",
+    "thumbnail", "category", "is_live", "duration", "duration_seconds", "view_count", "updated_at"
+)
+
+class HotVideo:
+    """Compact copy of a video's list columns; reads like a Video for the serializers"""
+    __slots__ = HOT_COLUMNS
+
+    def __init__(self, *values):
+        for name, value in zip(HOT_COLUMNS, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "HotVideo":
+        return cls(*(row[name] for name in HOT_COLUMNS))
+
+    def updated(self, values: Dict) -> "HotVideo":
+        """A copy with values applied; entries are never mutated while requests read them"""
+        return HotVideo(*(values.get(name, getattr(self, name)) for name in HOT_COLUMNS))
+
+def _order_key(video: HotVideo) -> tuple:
+    return (video.published, video.id)
+
+class HotBuffer:
+    """The newest videos of one list, newest first, as of one dataset version"""
+    __slots__ = ("videos", "total", "version")
+
+    def __init__(self, videos: Iterable[HotVideo], total: int, version: int, size: int = HOT_INDEX_SIZE):
+        # Bounded ring buffer; videos past size are dropped
+        self.videos = deque(videos, maxlen=size)
+        self.total = total
+        self.version = version
+
+    def newest(self, limit: Optional[int]) -> Optional[List[HotVideo]]:
+        """The newest limit videos (all when limit is None), or None if the buffer doesn't hold them"""
+        complete = len(self.videos) >= self.total
+        if limit is None:
+            return list(self.videos) if complete else None
+        if limit > len(self.videos) and not complete:
+            return None
+        return list(islice(self.videos, limit))
+
+def _belongs(name: str, video: HotVideo) -> bool:
+    if name == "live":
+        return bool(video.is_live)
+    if name.startswith("category:"):
+        return video.category == name.split(":", 1)[1]
+    return True
+
+def buffer_name(category: Optional[str] = None, is_live: Optional[bool] = None) -> Optional[str]:
+    """Buffer that holds the newest videos for a list filter, or None if no buffer does"""
+    if is_live is False or (is_live and category):
+        return None
+    if is_live:
+        return "live"
+    return f"category:{category}" if category else "all"
+
+class HotIndex:
+    """Newest videos overall, per category and live, served without touching SQLite.
+
+    A buffer is used only while its dataset version is current. The ingesting
+    process pushes the rows it just upserted into its buffers (apply_upsert)
+    and reloads the ones a delete touched (refresh_categories); other workers
+    refresh a buffer on the first request after its version moves. A refresh
+    reads the rows, the maintained count and the version in one snapshot, so
+    a buffer never mixes two states.
+    """
+
+    def __init__(self, size: int = HOT_INDEX_SIZE, enabled: bool = HOT_INDEX_ENABLED):
+        self.size = size
+        self.enabled = enabled
+        self._buffers: Dict[str, HotBuffer] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.patches = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._buffers
+
+    @staticmethod
+    def _dataset(name: str) -> str:
+        if name.startswith("category:"):
+            return f"videos:{name.split(':', 1)[1]}"
+        # Any change can add to the overall list or flip a live flag
+        return "videos"
+
+    def fresh(self, name: str, versions: Dict[str, int]) -> Optional[HotBuffer]:
+        """The buffer if it reflects the given dataset versions, without touching the database"""
+        buffer = self._buffers.get(name)
+        if buffer is not None and buffer.version >= version_of(versions, self._dataset(name)):
+            return buffer
+        return None
+
+    def page(self, name: str, versions: Dict[str, int], limit: Optional[int]) -> Optional[Tuple[List[HotVideo], int]]:
+        """(newest videos, total) from a fresh buffer, or None when the database must answer"""
+        buffer = self.fresh(name, versions)
+        videos = buffer.newest(limit) if buffer is not None else None
+        if videos is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return videos, buffer.total
+
+    def refresh(self, name: str) -> HotBuffer:
+        """Reload one buffer from the database; blocking, run it in the DB pool"""
+        db = SessionLocal()
+        try:
+            # One read transaction, so rows, count and version agree
+            version = version_of(read_dataset_versions(db), self._dataset(name))
+            if name == "live":
+                query, total = video_list_query(db, is_live=True), maintained_total(db, is_live=True)
+            elif name == "all":
+                query, total = video_list_query(db), maintained_total(db)
+            else:
+                category = name.split(":", 1)[1]
+                query, total = video_list_query(db, category=category), maintained_total(db, category=category)
+            rows = query.with_entities(*(getattr(Video, column) for column in HOT_COLUMNS)).limit(self.size).all()
+        finally:
+            db.close()
+
+        buffer = HotBuffer((HotVideo(*row) for row in rows), total, version, self.size)
+        with self._lock:
+            current = self._buffers.get(name)
+            # A slower concurrent refresh must not replace a newer snapshot
+            if current is None or current.version <= buffer.version:
+                self._buffers[name] = buffer
+            self.refreshes += 1
+            return self._buffers[name]
+
+    def seed(self):
+        """Load the overall, live and every category's buffer; call at startup"""
+        if not self.enabled:
+            return
+        db = SessionLocal()
+        try:
+            categories = [
+                value for value, in db.query(VideoCount.value).filter(VideoCount.dimension == "category")
+            ]
+        finally:
+            db.close()
+        for name in ["all", "live"] + [f"category:{category}" for category in categories]:
+            self.refresh(name)
+        stats = self.get_stats()
+        logger.info(f"Hot index seeded: {stats['entries']} videos in {stats['buffers']} buffers")
+
+    def _refresh_quietly(self, name: str):
+        try:
+            self.refresh(name)
+        except Exception as e:
+            # Requests fall back to the database until the next refresh
+            logger.error(f"Error refreshing hot index buffer {name}: {e}")
+
+    def refresh_categories(self, categories: Iterable[str]):
+        """Reload what a committed delete in these categories affects; for writers"""
+        if not self.enabled or not self._buffers:
+            return
+        for name in ["all", "live"] + [f"category:{category}" for category in set(categories)]:
+            self._refresh_quietly(name)
+
+    def _patched(self, name: str, buffer: HotBuffer, inserted: List[HotVideo], updates: Dict[str, Dict]) -> Optional[List[HotVideo]]:
+        """The buffer's videos with a write applied, or None if only a reload can tell"""
+        videos = []
+        for video in buffer.videos:
+            values = updates.get(video.id)
+            if values is not None:
+                video = video.updated(values)
+                if not _belongs(name, video):
+                    continue
+            videos.append(video)
+
+        held = {video.id for video in buffer.videos}
+        if name == "live" and any(values.get("is_live") and video_id not in held for video_id, values in updates.items()):
+            # A video went live that this buffer never held a copy of
+            return None
+
+        added = [video for video in inserted if _belongs(name, video)]
+        if len(buffer.videos) < buffer.total and buffer.videos:
+            # Only the newest rows are held; an older insert could land past
+            # rows the buffer never saw, so it stays out
+            floor = _order_key(buffer.videos[-1])
+            added = [video for video in added if _order_key(video) > floor]
+        if not added:
+            return videos
+        return sorted(videos + added, key=_order_key, reverse=True)
+
+    def apply_upsert(
+        self,
+        categories: Iterable[str],
+        rows: List[Dict],
+        updates: Dict[str, Dict],
+        deltas: Dict[Tuple[str, str], int],
+        versions: Dict[str, int]
+    ):
+        """Push a committed upsert in these categories into the buffers in memory; for writers.
+
+        rows are the inserted rows, updates the new column values of updated
+        videos by ID, deltas the video_counts changes and versions the dataset
+        versions the write committed. A buffer is patched only if it was
+        current right before the write (one version behind); otherwise it is
+        reloaded from the database.
+        """
+        if not self.enabled or not self._buffers:
+            return
+        inserted = [HotVideo.from_row(row) for row in rows]
+        totals = {"all": ("all", ""), "live": ("is_live", "true")}
+
+        stale = []
+        for name in ["all", "live"] + [f"category:{category}" for category in set(categories)]:
+            version = version_of(versions, self._dataset(name))
+            with self._lock:
+                buffer = self._buffers.get(name)
+                if buffer is None or buffer.version >= version:
+                    # Loaded on its first request, or already reloaded past this write
+                    continue
+                videos = self._patched(name, buffer, inserted, updates) if buffer.version == version - 1 else None
+                if videos is None:
+                    stale.append(name)
+                    continue
+                total = buffer.total + deltas.get(totals.get(name) or ("category", name.split(":", 1)[1]), 0)
+                # A deque with maxlen keeps the last items, so trim the oldest first
+                self._buffers[name] = HotBuffer(videos[:self.size], total, version, self.size)
+                self.patches += 1
+        for name in stale:
+            self._refresh_quietly(name)
+
+    def get_stats(self) -> Dict:
+        buffers = list(self._buffers.values())
+        entries = {id(video): video for buffer in buffers for video in buffer.videos}
+        entry_bytes = sum(hot_video_bytes(video) for video in entries.values())
+        return {
+            "enabled": self.enabled,
+            "buffers": len(buffers),
+            "size": self.size,
+            "entries": len(entries),
+            "bytes": entry_bytes,
+            "bytesPerEntry": round(entry_bytes / len(entries)) if entries else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "patches": self.patches
+        }
+
+def hot_video_bytes(video: HotVideo) -> int:
+    """Memory held by one entry: the slots object plus values it doesn't share"""
+    size = sys.getsizeof(video)
+    for name in HOT_COLUMNS:
+        value = getattr(video, name)
+        if value is not None and not isinstance(value, bool):
+            size += sys.getsizeof(value)
+    return size
+
+hot_index = HotIndex()
@@ -0,0 +1,60 @@
+import httpx
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Connection pool configuration
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_client: Optional[httpx.AsyncClient] = None
+
+def _create_client() -> httpx.AsyncClient:
+    """Create an AsyncClient backed by a keep-alive connection pool"""
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    )
+    return httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT,
+        limits=limits,
+        http2=HTTP2_AVAILABLE
+    )
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the application-wide HTTP client (called on app startup)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+        logger.info(
+            f"HTTP client pool started (http2={HTTP2_AVAILABLE}, "
+            f"max_connections={HTTP_MAX_CONNECTIONS})"
+        )
+    return _client
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it if the app hasn't started one"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+    return _client
+
+async def close_http_client():
+    """Close the shared HTTP client and its pooled connections (called on app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("HTTP client pool closed")
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# A stage handler takes a batch of input items and returns the items for the next stage
+StageHandler = Callable[[List[Any]], Awaitable[Optional[List[Any]]]]
+
+class PipelineStage:
+    """A pool of workers draining a bounded queue into the next stage.
+
+    When the next stage's queue is full, workers block on it, so a slow stage
+    applies backpressure upstream instead of letting work pile up in memory.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: StageHandler,
+        concurrency: int = 1,
+        queue_size: int = 100,
+        batch_size: int = 1
+    ):
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.next_stage: Optional["PipelineStage"] = None
+
+        # Queues are created on start() so they bind to the running loop
+        self.queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._stopped = False
+
+        self.processed = 0
+        self.dropped = 0
+        self.emitted = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self._started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self):
+        if self.running:
+            return
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._started_at = time.perf_counter()
+        self._stopped = False
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        self._stopped = True
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._drain()
+
+    def _drain(self):
+        """Drop queued items nobody will process, so join() doesn't wait on them"""
+        if self.queue is None:
+            return
+        dropped = 0
+        while True:
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self.queue.task_done()
+            dropped += 1
+        if dropped:
+            self.dropped += dropped
+            logger.info(f"Dropped {dropped} queued items from stopped ingestion stage '{self.name}'")
+
+    async def put(self, item: Any):
+        await self.queue.put(item)
+        if self._stopped:
+            # The stage stopped while this put waited for room
+            self._drain()
+
+    async def join(self):
+        await self.queue.join()
+
+    def _take_batch(self, first: Any) -> List[Any]:
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = self._take_batch(await self.queue.get())
+            try:
+                handler_start = time.perf_counter()
+                outputs = await self.handler(batch) or []
+                self.busy_seconds += time.perf_counter() - handler_start
+
+                if self.next_stage is not None:
+                    put_start = time.perf_counter()
+                    for output in outputs:
+                        await self.next_stage.put(output)
+                    self.blocked_seconds += time.perf_counter() - put_start
+                self.emitted += len(outputs)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += len(batch)
+                logger.error(f"Error in ingestion stage '{self.name}': {e}")
+            finally:
+                self.processed += len(batch)
+                for _ in batch:
+                    self.queue.task_done()
+
+    def get_stats(self) -> Dict:
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            "concurrency": self.concurrency,
+            "batchSize": self.batch_size,
+            "queueDepth": self.queue.qsize() if self.queue is not None else 0,
+            "queueSize": self.queue_size,
+            "processed": self.processed,
+            "emitted": self.emitted,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "throughput": round(self.processed / elapsed, 3) if elapsed else 0.0,
+            "busySeconds": round(self.busy_seconds, 3),
+            "blockedSeconds": round(self.blocked_seconds, 3)
+        }
+
+class IngestionPipeline:
+    """Chain of stages joined by bounded queues"""
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = stages
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next_stage = next_stage
+
+    @property
+    def running(self) -> bool:
+        return all(stage.running for stage in self.stages)
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    async def stop(self):
+        for stage in self.stages:
+            await stage.stop()
+
+    async def run(self, items: List[Any]):
+        """Feed items into the first stage and wait until every stage has drained"""
+        if not self.running:
+            self.start()
+        for item in items:
+            if not self.running:
+                # stop() ran mid-cycle; its drain lets the joins below return
+                break
+            await self.stages[0].put(item)
+        # A stage hands its outputs downstream before marking its input done,
+        # so joining the stages in order waits for the whole batch
+        for stage in self.stages:
+            await stage.join()
+
+    def get_stats(self) -> Dict:
+        return {stage.name: stage.get_stats() for stage in self.stages}
@@ -0,0 +1,43 @@
+import json
+from typing import Any, Dict, Iterable
+
+from fastapi.responses import Response
+
+# orjson encodes several times faster than the json module; it's optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON for value"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+def join_array(items: Iterable[bytes]) -> bytes:
+    """A JSON array from already-encoded items"""
+    return b"[" + b",".join(items) + b"]"
+
+def with_members(obj: bytes, members: Dict[str, Any]) -> bytes:
+    """Add members to an encoded JSON object; values may be pre-encoded bytes"""
+    if not members:
+        return obj
+    encoded = b",".join(
+        dumps(name) + b":" + (value if isinstance(value, bytes) else dumps(value))
+        for name, value in members.items()
+    )
+    return obj[:-1] + (b"," if obj != b"{}" else b"") + encoded + b"}"
+
+class JSONBytesResponse(Response):
+    """JSON response whose content is already encoded, or is encoded with dumps.
+
+    Returning it from an endpoint skips FastAPI's jsonable_encoder pass.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+class LeaderLock:
+    """Elects one ingestion leader among the processes sharing a lock file.
+
+    Uses an exclusive, non-blocking OS file lock, so it needs no outside
+    services. The OS drops the lock when the holder exits (even if it crashes),
+    and the followers, which keep retrying, take over on their next attempt.
+    """
+
+    def __init__(self, lock_path: str, retry_interval: float = 10):
+        self.lock_path = lock_path
+        self.retry_interval = retry_interval
+        self._file: Optional[IO] = None
+        self._stopped = False
+
+    @property
+    def is_leader(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        """Try once to take the lock without blocking"""
+        if self.is_leader:
+            return True
+        lock_file = open(self.lock_path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            return False
+
+        # Record the holder for anyone inspecting the lock file
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    async def acquire(self) -> bool:
+        """Wait until this process becomes the leader; False if released first"""
+        self._stopped = False
+        while not self._stopped:
+            if self.try_acquire():
+                logger.info(f"Process {os.getpid()} is the ingestion leader")
+                return True
+            await asyncio.sleep(self.retry_interval)
+        return False
+
+    @contextmanager
+    def held(self) -> Iterator[None]:
+        """Block until the lock is taken, and release it on exit.
+
+        For short critical sections such as migrations, rather than leadership.
+        """
+        while not self.try_acquire():
+            time.sleep(self.retry_interval)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def release(self):
+        """Give up leadership (or stop waiting for it)"""
+        self._stopped = True
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+        logger.info(f"Process {os.getpid()} released ingestion leadership")
@@ -1,21 +1,43 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
+from fastapi.responses import JSONResponse, Response
+from typing import List, Optional, Dict, Any, Tuple
 import asyncio
+import functools
+import inspect
 import json
 import logging
+import os
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-from models import Video, Channel, Category
-from database import engine, SessionLocal
+from sqlalchemy.orm import undefer
+
+from models import Video, Channel
+from database import engine
+from db_executor import run_in_db, run_with_session, shutdown_db_executor
+from category_map import category_channel_map
+from dataset_version import dataset_versions, version_of
+from hot_index import buffer_name, hot_index
+from response_cache import response_cache
+from json_response import JSONBytesResponse, dumps, join_array, with_members
+from video_time import epoch_ms
+from video_fields import ALL_FIELDS, load_fields, parse_fields, video_data_to_dict, video_fragments
+from migrations import run_migrations
+from video_queries import (
+    FULL_TEXT_SEARCH, video_list_query, live_videos_query, search_videos_query, category_videos_query,
+    decode_cursor, encode_cursor, keyset_position, after_position, maintained_total, facet_counts,
+    search_total_is_capped
+)
 from rss_fetcher import RSSFetcher
 from websocket_manager import WebSocketManager
 from video_apis import VideoAPIs
+from http_client import start_http_client, close_http_client
+from leader_election import LeaderLock
+from retention import RetentionJob, RETENTION_ENABLED
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -40,25 +62,177 @@ app.add_middleware(
 websocket_manager = WebSocketManager()
 
 # RSS fetcher
-rss_fetcher = RSSFetcher()
+rss_fetcher = RSSFetcher(websocket_manager)
 
 # Video APIs
 video_apis = VideoAPIs()
 
+# Only one worker process runs ingestion; the others serve the API
+LEADER_ELECTION = os.getenv("INGESTION_LEADER_ELECTION", "true").lower() == "true"
+ingestion_leader = LeaderLock(
+    os.getenv("INGESTION_LOCK_FILE", "./ingestion.lock"),
+    retry_interval=float(os.getenv("INGESTION_LEADER_RETRY_INTERVAL", "10"))
+)
+
+# Serializes schema migrations across worker processes on this host
+MIGRATION_LOCK_FILE = os.getenv("MIGRATION_LOCK_FILE", "./migrations.lock")
+
+# Prunes expired videos; runs alongside ingestion so one process writes
+retention_job = RetentionJob()
+
+# Caches may keep list responses but must revalidate them (cheap with a 304)
+# once they are HTTP_CACHE_MAX_AGE seconds old
+HTTP_CACHE_CONTROL = f"public, max-age={int(os.getenv('HTTP_CACHE_MAX_AGE', '0'))}, must-revalidate"
+
+# Seconds a category page waits for YouTube, Vimeo and demo sources before answering without them
+EXTERNAL_SOURCES_DEADLINE = float(os.getenv("EXTERNAL_SOURCES_DEADLINE", "2"))
+# Marks a response served without some of its sources; it is never cached
+DEGRADED_HEADER = "X-Degraded"
+
+FIELDS_DESCRIPTION = "Comma-separated video fields to return, e.g. title,thumbnail,channel; description is only sent when listed"
+
+def selected_fields(fields: Optional[str]):
+    """Parsed ?fields= for a list endpoint; unknown field names are a 400"""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def success_response(data: bytes, **members) -> JSONBytesResponse:
+    """{"success": true, "data": ...} around already-encoded data"""
+    return JSONBytesResponse(with_members(b'{"success":true}', {"data": data, **members}))
+
+def normalized_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Query parameters with equivalent spellings made equal ("all" is no category)"""
+    normalized = dict(params)
+    if normalized.get("category") == "all":
+        normalized["category"] = None
+    if normalized.get("fields"):
+        try:
+            normalized["fields"] = ",".join(parse_fields(normalized["fields"]))
+        except ValueError:
+            pass  # the endpoint answers with a 400
+    return normalized
+
+def video_dataset(category: Optional[str]) -> str:
+    """Dataset version that changes whenever videos in category (or any video) change"""
+    return f"videos:{category}" if category else "videos"
+
+async def current_versions() -> Dict[str, int]:
+    """Dataset versions, from memory unless the cached copy has expired"""
+    return dataset_versions.cached() or await run_in_db(dataset_versions.load)
+
+async def hot_page(name: Optional[str], limit: Optional[int], fields) -> Optional[Tuple[List, int]]:
+    """(newest videos, total) for a first page from the hot index, or None when the database must answer"""
+    if name is None or name not in hot_index or "description" in fields:
+        return None
+    versions = await current_versions()
+    if hot_index.fresh(name, versions) is None:
+        # First request since another process changed this list
+        await run_in_db(hot_index.refresh, name)
+    return hot_index.page(name, versions, limit)
+
+def cached_response(category_of):
+    """Serve an endpoint's JSON from response_cache, keyed on its normalized query parameters.
+
+    category_of(params) names the category the response depends on, or None
+    when it may include any category; ingestion invalidates by category. The
+    key includes that dataset's version, so a change made by another worker
+    retires the entry too.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(**params):
+            normalized = normalized_params(params)
+            category = category_of(normalized)
+            version = version_of(await current_versions(), video_dataset(category))
+            key = response_cache.make_key(endpoint.__name__, {**normalized, "version": version})
+            body = response_cache.get(key)
+            if body is not None:
+                return JSONBytesResponse(body, headers={"X-Cache": "HIT"})
+
+            generation = response_cache.generation
+            response = await endpoint(**params)
+            if not isinstance(response, Response):
+                response = JSONBytesResponse(response)
+            response.headers["X-Cache"] = "MISS"
+            if DEGRADED_HEADER not in response.headers:
+                # A degraded page would outlive the outage; the next request retries its sources
+                response_cache.put(key, response.body, category, generation)
+            return response
+        return wrapper
+    return decorator
+
+def etag_response(dataset_of):
+    """Tag an endpoint's JSON with a strong ETag from the dataset version it reads.
+
+    dataset_of(params) names the dataset. A request whose If-None-Match holds
+    the current tag gets a 304 before the endpoint runs. The version is read
+    before the endpoint so a tag never claims data newer than the body.
+    """
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(request: Request, **params):
+            dataset = dataset_of(normalized_params(params))
+            etag = f'"{dataset}-{version_of(await current_versions(), dataset)}"'
+            headers = {"ETag": etag, "Cache-Control": HTTP_CACHE_CONTROL}
+
+            if_none_match = request.headers.get("if-none-match", "")
+            if if_none_match.strip() == "*" or etag in (
+                tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+            ):
+                return Response(status_code=304, headers=headers)
+
+            response = await endpoint(**params)
+            if not isinstance(response, Response):
+                response = JSONBytesResponse(response)
+            response.headers.update(headers)
+            return response
+
+        # FastAPI reads the signature to inject the request alongside the endpoint's own parameters
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        ])
+        return wrapper
+    return decorator
+
+async def run_ingestion():
+    """Start RSS fetching and retention once this process holds the ingestion lock"""
+    if LEADER_ELECTION and not await ingestion_leader.acquire():
+        return
+    if RETENTION_ENABLED:
+        asyncio.create_task(retention_job.start())
+    await rss_fetcher.start_fetching()
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and start background tasks"""
-    # Create database tables
-    from models import Base
-    Base.metadata.create_all(bind=engine)
+    # Create database tables; workers starting together take turns
+    run_migrations(engine, lock_path=MIGRATION_LOCK_FILE)
+    
+    # Every worker serves first pages from memory
+    try:
+        await run_in_db(hot_index.seed)
+    except Exception as e:
+        logger.error(f"Error seeding hot index: {e}")
+    
+    # Shared HTTP connection pool for RSS feeds and external APIs
+    await start_http_client()
     
     # Start RSS fetching task
-    asyncio.create_task(rss_fetcher.start_fetching())
+    asyncio.create_task(run_ingestion())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     await rss_fetcher.stop_fetching()
+    retention_job.stop()
+    ingestion_leader.release()
+    await close_http_client()
+    shutdown_db_executor()
 
 @app.get("/")
 async def root():
@@ -69,219 +243,201 @@ async def root():
         "status": "running"
     }
 
+@app.get("/api/stats/ingestion")
+async def get_ingestion_stats():
+    """Get RSS ingestion statistics such as cycle wall time and per-channel latency"""
+    return {
+        "success": True,
+        "data": {
+            "leader": ingestion_leader.is_leader or not LEADER_ELECTION,
+            **rss_fetcher.get_stats(),
+            "retention": retention_job.get_stats()
+        }
+    }
+
+@app.get("/api/stats/cache")
+async def get_cache_stats():
+    """Get response cache hit, miss and eviction statistics"""
+    return {
+        "success": True,
+        "data": {
+            **response_cache.get_stats(),
+            "videoFragments": video_fragments.get_stats(),
+            "hotIndex": hot_index.get_stats()
+        }
+    }
+
 @app.get("/api/videos")
+@etag_response(lambda params: video_dataset(params["category"]))
+@cached_response(lambda params: params["category"])
 async def get_videos(
     category: Optional[str] = Query(None, description="Filter by category"),
     channel: Optional[str] = Query(None, description="Filter by channel ID"),
     is_live: Optional[bool] = Query(None, description="Filter by live status"),
     search: Optional[str] = Query(None, description="Search in titles and descriptions"),
+    min_duration: Optional[int] = Query(None, ge=0, description="Minimum duration in seconds"),
+    max_duration: Optional[int] = Query(None, ge=0, description="Maximum duration in seconds"),
     limit: int = Query(20, ge=1, le=100, description="Number of videos to return"),
-    offset: int = Query(0, ge=0, description="Number of videos to skip")
+    offset: int = Query(0, ge=0, description="Number of videos to skip"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page; takes precedence over offset"),
+    include_total: bool = Query(True, description="Count all matching videos; pass false when paging by cursor"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """Get videos with optional filtering"""
+    video_fields = selected_fields(fields)
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    # Relevance order has no stable key, so search cursors carry an offset
+    ranked = bool(search) and FULL_TEXT_SEARCH
+    
+    def fetch_page(db):
+        query = video_list_query(
+            db, category=category, channel=channel, is_live=is_live, search=search,
+            min_duration=min_duration, max_duration=max_duration
+        )
+        total = None
+        if include_total:
+            if not search and min_duration is None and max_duration is None:
+                total = maintained_total(db, category=category, channel=channel, is_live=is_live)
+            if total is None:
+                # Ordering doesn't change the count and would make SQLite sort every row
+                total = query.order_by(None).count()
+        
+        # Apply pagination; one extra row tells us whether another page exists
+        start = offset
+        if position is not None and "offset" in position:
+            start = position["offset"]
+        elif position is not None:
+            query = after_position(query, position)
+            start = 0
+        return total, start, load_fields(query, video_fields).offset(start).limit(limit + 1).all()
+    
     try:
-        db = SessionLocal()
-        
-        # Build query
-        query = db.query(Video)
-        
-        if category and category != "all":
-            query = query.filter(Video.category == category)
-        
-        if channel:
-            query = query.filter(Video.channel_id == channel)
-        
-        if is_live is not None:
-            query = query.filter(Video.is_live == is_live)
-        
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                (Video.title.ilike(search_term)) |
-                (Video.description.ilike(search_term))
-            )
-        
-        # Order by published date (newest first)
-        query = query.order_by(Video.published.desc())
-        
-        # Apply pagination
-        total = query.count()
-        videos = query.offset(offset).limit(limit).all()
+        # First pages of the plain and per-category lists come from memory
+        hot = None
+        if position is None and offset == 0 and not (search or channel) and min_duration is None and max_duration is None:
+            hot = await hot_page(buffer_name(category if category != "all" else None, is_live), limit + 1, video_fields)
+        if hot is not None:
+            videos, total = hot
+            start = 0
+            if not include_total:
+                total = None
+        else:
+            total, start, videos = await run_with_session(fetch_page)
+        
+        next_cursor = None
+        if len(videos) > limit:
+            videos = videos[:limit]
+            if ranked:
+                next_cursor = encode_cursor({"offset": start + limit})
+            else:
+                next_cursor = encode_cursor(keyset_position(videos[-1]))
         
         # Convert to response format
-        video_list = []
-        for video in videos:
-            video_data = {
-                "id": video.id,
-                "title": video.title,
-                "channel": {
-                    "id": video.channel_id,
-                    "name": video.channel_name
-                },
-                "published": int(video.published.timestamp() * 1000),
-                "url": video.url,
-                "embedUrl": video.embed_url,
-                "thumbnail": video.thumbnail,
-                "category": video.category,
-                "isLive": video.is_live,
-                "duration": video.duration,
-                "viewCount": video.view_count,
-                "description": video.description
-            }
-            video_list.append(video_data)
+        video_list = [video_fragments.encode(video, video_fields) for video in videos]
         
-        return {
-            "success": True,
-            "data": video_list,
-            "total": total,
+        page = {
             "limit": limit,
-            "offset": offset
+            "offset": start,
+            "nextCursor": next_cursor
         }
+        if total is not None:
+            page["total"] = total
+            if ranked and search_total_is_capped(total):
+                # Only the newest SEARCH_CANDIDATES matches are ranked and counted
+                page["totalApproximate"] = True
+        return success_response(join_array(video_list), **page)
         
     except Exception as e:
         logger.error(f"Error fetching videos: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
 
-@app.get("/api/videos/{video_id}")
-async def get_video(video_id: str):
-    """Get a specific video by ID"""
+@app.get("/api/videos/facets")
+async def get_video_facets():
+    """Get video counts per category, per channel and for live/not live"""
     try:
-        db = SessionLocal()
-        video = db.query(Video).filter(Video.id == video_id).first()
-        
-        if not video:
-            raise HTTPException(status_code=404, detail="Video not found")
-        
-        video_data = {
-            "id": video.id,
-            "title": video.title,
-            "channel": {
-                "id": video.channel_id,
-                "name": video.channel_name
-            },
-            "published": int(video.published.timestamp() * 1000),
-            "url": video.url,
-            "embedUrl": video.embed_url,
-            "thumbnail": video.thumbnail,
-            "category": video.category,
-            "isLive": video.is_live,
-            "duration": video.duration,
-            "viewCount": video.view_count,
-            "description": video.description
-        }
-        
+        facets = await run_with_session(facet_counts)
         return {
             "success": True,
-            "data": video_data
+            "data": facets
         }
         
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Error fetching video {video_id}: {e}")
+        logger.error(f"Error fetching video facets: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
 
 @app.get("/api/videos/live")
-async def get_live_videos():
+@cached_response(lambda params: None)
+async def get_live_videos(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """Get all currently live videos"""
+    video_fields = selected_fields(fields)
     try:
-        db = SessionLocal()
-        videos = db.query(Video).filter(Video.is_live == True).order_by(Video.published.desc()).all()
+        hot = await hot_page("live", None, video_fields)
+        if hot is not None:
+            videos = hot[0]
+        else:
+            videos = await run_with_session(
+                lambda db: load_fields(live_videos_query(db), video_fields).all()
+            )
         
-        video_list = []
-        for video in videos:
-            video_data = {
-                "id": video.id,
-                "title": video.title,
-                "channel": {
-                    "id": video.channel_id,
-                    "name": video.channel_name
-                },
-                "published": int(video.published.timestamp() * 1000),
-                "url": video.url,
-                "embedUrl": video.embed_url,
-                "thumbnail": video.thumbnail,
-                "category": video.category,
-                "isLive": video.is_live,
-                "duration": video.duration,
-                "viewCount": video.view_count,
-                "description": video.description
-            }
-            video_list.append(video_data)
+        video_list = [video_fragments.encode(video, video_fields) for video in videos]
         
-        return {
-            "success": True,
-            "data": video_list
-        }
+        return success_response(join_array(video_list))
         
     except Exception as e:
         logger.error(f"Error fetching live videos: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
 
 @app.get("/api/search")
 async def search_videos(
     q: str = Query(..., description="Search query"),
-    limit: int = Query(20, ge=1, le=100, description="Number of results to return")
+    min_duration: Optional[int] = Query(None, ge=0, description="Minimum duration in seconds"),
+    max_duration: Optional[int] = Query(None, ge=0, description="Maximum duration in seconds"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
-    """Search videos by title and description"""
+    """Search videos by title, description and channel, most relevant first"""
+    video_fields = selected_fields(fields)
     try:
-        db = SessionLocal()
-        search_term = f"%{q}%"
-        
-        videos = db.query(Video).filter(
-            (Video.title.ilike(search_term)) |
-            (Video.description.ilike(search_term)) |
-            (Video.channel_name.ilike(search_term))
-        ).order_by(Video.published.desc()).limit(limit).all()
+        results = await run_with_session(lambda db: load_fields(
+            search_videos_query(db, q, min_duration=min_duration, max_duration=max_duration), video_fields
+        ).limit(limit).all())
         
         video_list = []
-        for video in videos:
-            video_data = {
-                "id": video.id,
-                "title": video.title,
-                "channel": {
-                    "id": video.channel_id,
-                    "name": video.channel_name
-                },
-                "published": int(video.published.timestamp() * 1000),
-                "url": video.url,
-                "embedUrl": video.embed_url,
-                "thumbnail": video.thumbnail,
-                "category": video.category,
-                "isLive": video.is_live,
-                "duration": video.duration,
-                "viewCount": video.view_count,
-                "description": video.description
-            }
+        for video, title_highlight, snippet in results:
+            video_data = video_fragments.encode(video, video_fields)
+            if title_highlight is not None:
+                video_data = with_members(video_data, {
+                    "highlight": {
+                        "title": title_highlight,
+                        "snippet": snippet
+                    }
+                })
             video_list.append(video_data)
         
-        return {
-            "success": True,
-            "data": {
-                "videos": video_list,
-                "total": len(video_list),
-                "query": q
-            }
-        }
+        return success_response(with_members(b"{}", {
+            "videos": join_array(video_list),
+            "total": len(video_list),
+            "query": q
+        }))
         
     except Exception as e:
         logger.error(f"Error searching videos: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
 
 @app.get("/api/channels")
+@etag_response(lambda params: "catalog")
 async def get_channels():
     """Get all channels"""
     try:
-        db = SessionLocal()
-        channels = db.query(Channel).all()
+        channels = await run_with_session(lambda db: db.query(Channel).all())
         
         channel_list = []
         for channel in channels:
@@ -303,25 +459,18 @@ async def get_channels():
     except Exception as e:
         logger.error(f"Error fetching channels: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
 
 @app.get("/api/categories")
+@etag_response(lambda params: "catalog")
 async def get_categories():
     """Get all categories"""
     try:
-        db = SessionLocal()
-        categories = db.query(Category).all()
-        
-        category_list = []
-        for category in categories:
-            category_data = {
-                "id": category.id,
-                "name": category.name,
-                "color": category.color,
-                "channels": category.channels.split(',') if category.channels else []
-            }
-            category_list.append(category_data)
+        # Served from the shared category -> channels map; only a stale map hits the database
+        # A map older than the catalog version would not match the ETag
+        catalog_version = version_of(await current_versions(), "catalog")
+        category_list = category_channel_map.cached(catalog_version)
+        if category_list is None:
+            category_list = await run_in_db(category_channel_map.load, catalog_version)
         
         return {
             "success": True,
@@ -331,265 +480,139 @@ async def get_categories():
     except Exception as e:
         logger.error(f"Error fetching categories: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
 
 @app.get("/api/videos/external/{category}")
 async def get_external_videos(
     category: str,
-    limit: int = Query(20, ge=1, le=50, description="Number of videos to return")
+    limit: int = Query(20, ge=1, le=50, description="Number of videos to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """Get videos from external sources (YouTube, Vimeo, etc.) for a specific category"""
+    video_fields = selected_fields(fields)
     try:
         # Fetch videos from external sources
         videos = await video_apis.fetch_all_sources(category, limit)
         
         # Convert to response format
-        video_list = []
-        for video in videos:
-            video_data = {
-                "id": video['id'],
-                "title": video['title'],
-                "channel": {
-                    "id": video['channel_id'],
-                    "name": video['channel_name']
-                },
-                "published": int(video['published'].timestamp() * 1000),
-                "url": video['url'],
-                "embedUrl": video['embed_url'],
-                "thumbnail": video['thumbnail'],
-                "category": video['category'],
-                "isLive": video['is_live'],
-                "duration": video['duration'],
-                "viewCount": video.get('view_count', 0),
-                "description": video['description'],
-                "source": "external"
-            }
-            video_list.append(video_data)
+        video_list = [
+            dumps({**video_data_to_dict(video, video_fields), "source": "external"})
+            for video in videos
+        ]
         
-        return {
-            "success": True,
-            "data": video_list,
-            "total": len(video_list),
-            "category": category
-        }
+        return success_response(join_array(video_list), total=len(video_list), category=category)
         
     except Exception as e:
         logger.error(f"Error fetching external videos for category {category}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/api/videos/health")
-async def get_health_videos(
-    limit: int = Query(20, ge=1, le=50, description="Number of videos to return")
+@app.get("/api/videos/category/{category}")
+@cached_response(lambda params: params["category"])
+async def get_category_videos(
+    category: str,
+    limit: int = Query(20, ge=1, le=50, description="Number of videos to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
-    """Get health-related videos from all sources"""
+    """Get a category's newest videos from the database and external sources, merged by recency"""
+    video_fields = selected_fields(fields)
+    
+    async def read_database():
+        # First try to get from memory, then the database
+        hot = await hot_page(f"category:{category}", limit, video_fields)
+        if hot is not None:
+            return hot[0]
+        return await run_with_session(
+            lambda db: load_fields(category_videos_query(db, category), video_fields).limit(limit).all()
+        )
+    
+    # Both sources are read at once; external ones get until the deadline, or
+    # until the database answers if that takes longer
+    database_task = asyncio.ensure_future(read_database())
+    external_task = asyncio.ensure_future(video_apis.fetch_all_sources(category, limit))
     try:
-        # First try to get from database
-        db = SessionLocal()
-        db_videos = db.query(Video).filter(Video.category == "health").order_by(Video.published.desc()).limit(limit).all()
-        
-        # Convert database videos to response format
-        video_list = []
+        await asyncio.wait({database_task, external_task}, timeout=EXTERNAL_SOURCES_DEADLINE)
+        db_videos = await database_task
+        
+        external_videos = []
+        degraded = True
+        if not external_task.done():
+            external_task.cancel()
+            logger.warning(f"External sources for {category} missed the {EXTERNAL_SOURCES_DEADLINE}s deadline")
+        elif external_task.exception() is not None:
+            logger.error(f"Error fetching external videos for category {category}: {external_task.exception()}")
+        else:
+            external_videos = external_task.result()
+            degraded = False
+        
+        # Newest first; a video that is both stored and fetched is sent once, from the database
+        merged = {}
         for video in db_videos:
-            video_data = {
-                "id": video.id,
-                "title": video.title,
-                "channel": {
-                    "id": video.channel_id,
-                    "name": video.channel_name
-                },
-                "published": int(video.published.timestamp() * 1000),
-                "url": video.url,
-                "embedUrl": video.embed_url,
-                "thumbnail": video.thumbnail,
-                "category": video.category,
-                "isLive": video.is_live,
-                "duration": video.duration,
-                "viewCount": video.view_count,
-                "description": video.description,
-                "source": "database"
-            }
-            video_list.append(video_data)
-        
-        # If we don't have enough videos, fetch from external sources
-        if len(video_list) < limit:
-            external_videos = await video_apis.fetch_all_sources("health", limit - len(video_list))
-            
-            for video in external_videos:
-                video_data = {
-                    "id": video['id'],
-                    "title": video['title'],
-                    "channel": {
-                        "id": video['channel_id'],
-                        "name": video['channel_name']
-                    },
-                    "published": int(video['published'].timestamp() * 1000),
-                    "url": video['url'],
-                    "embedUrl": video['embed_url'],
-                    "thumbnail": video['thumbnail'],
-                    "category": video['category'],
-                    "isLive": video['is_live'],
-                    "duration": video['duration'],
-                    "viewCount": video.get('view_count', 0),
-                    "description": video['description'],
-                    "source": "external"
-                }
-                video_list.append(video_data)
-        
-        return {
-            "success": True,
-            "data": video_list,
-            "total": len(video_list),
-            "category": "health"
-        }
+            merged[video.id] = (
+                epoch_ms(video.published),
+                with_members(video_fragments.encode(video, video_fields), {"source": "database"})
+            )
+        for video in external_videos:
+            if video["id"] not in merged:
+                merged[video["id"]] = (
+                    video.get("published_ms") or epoch_ms(video["published"]),
+                    dumps({**video_data_to_dict(video, video_fields), "source": "external"})
+                )
+        video_list = [body for _, body in sorted(merged.values(), key=lambda item: item[0], reverse=True)[:limit]]
+        
+        response = success_response(join_array(video_list), total=len(video_list), category=category)
+        if degraded:
+            response.headers[DEGRADED_HEADER] = "external-sources"
+            response.headers["Cache-Control"] = "no-store"
+        return response
         
     except Exception as e:
-        logger.error(f"Error fetching health videos: {e}")
+        external_task.cancel()
+        logger.error(f"Error fetching {category} videos: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
+
+@app.get("/api/videos/health")
+async def get_health_videos(
+    limit: int = Query(20, ge=1, le=50, description="Number of videos to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """Get health-related videos from all sources"""
+    return await get_category_videos(category="health", limit=limit, fields=fields)
 
 @app.get("/api/videos/entertainment")
 async def get_entertainment_videos(
-    limit: int = Query(20, ge=1, le=50, description="Number of videos to return")
+    limit: int = Query(20, ge=1, le=50, description="Number of videos to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """Get entertainment-related videos from all sources"""
-    try:
-        # First try to get from database
-        db = SessionLocal()
-        db_videos = db.query(Video).filter(Video.category == "entertainment").order_by(Video.published.desc()).limit(limit).all()
-        
-        # Convert database videos to response format
-        video_list = []
-        for video in db_videos:
-            video_data = {
-                "id": video.id,
-                "title": video.title,
-                "channel": {
-                    "id": video.channel_id,
-                    "name": video.channel_name
-                },
-                "published": int(video.published.timestamp() * 1000),
-                "url": video.url,
-                "embedUrl": video.embed_url,
-                "thumbnail": video.thumbnail,
-                "category": video.category,
-                "isLive": video.is_live,
-                "duration": video.duration,
-                "viewCount": video.view_count,
-                "description": video.description,
-                "source": "database"
-            }
-            video_list.append(video_data)
-        
-        # If we don't have enough videos, fetch from external sources
-        if len(video_list) < limit:
-            external_videos = await video_apis.fetch_all_sources("entertainment", limit - len(video_list))
-            
-            for video in external_videos:
-                video_data = {
-                    "id": video['id'],
-                    "title": video['title'],
-                    "channel": {
-                        "id": video['channel_id'],
-                        "name": video['channel_name']
-                    },
-                    "published": int(video['published'].timestamp() * 1000),
-                    "url": video['url'],
-                    "embedUrl": video['embed_url'],
-                    "thumbnail": video['thumbnail'],
-                    "category": video['category'],
-                    "isLive": video['is_live'],
-                    "duration": video['duration'],
-                    "viewCount": video.get('view_count', 0),
-                    "description": video['description'],
-                    "source": "external"
-                }
-                video_list.append(video_data)
-        
-        return {
-            "success": True,
-            "data": video_list,
-            "total": len(video_list),
-            "category": "entertainment"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error fetching entertainment videos: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
+    return await get_category_videos(category="entertainment", limit=limit, fields=fields)
 
 @app.get("/api/videos/science")
 async def get_science_videos(
-    limit: int = Query(20, ge=1, le=50, description="Number of videos to return")
+    limit: int = Query(20, ge=1, le=50, description="Number of videos to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """Get science-related videos from all sources"""
+    return await get_category_videos(category="science", limit=limit, fields=fields)
+
+# Declared after every other /api/videos/<name> route, which it would otherwise shadow
+@app.get("/api/videos/{video_id}")
+@etag_response(lambda params: "videos")
+async def get_video(video_id: str):
+    """Get a specific video by ID"""
     try:
-        # First try to get from database
-        db = SessionLocal()
-        db_videos = db.query(Video).filter(Video.category == "science").order_by(Video.published.desc()).limit(limit).all()
-        
-        # Convert database videos to response format
-        video_list = []
-        for video in db_videos:
-            video_data = {
-                "id": video.id,
-                "title": video.title,
-                "channel": {
-                    "id": video.channel_id,
-                    "name": video.channel_name
-                },
-                "published": int(video.published.timestamp() * 1000),
-                "url": video.url,
-                "embedUrl": video.embed_url,
-                "thumbnail": video.thumbnail,
-                "category": video.category,
-                "isLive": video.is_live,
-                "duration": video.duration,
-                "viewCount": video.view_count,
-                "description": video.description,
-                "source": "database"
-            }
-            video_list.append(video_data)
+        video = await run_with_session(
+            lambda db: db.query(Video).options(undefer(Video.description)).filter(Video.id == video_id).first()
+        )
         
-        # If we don't have enough videos, fetch from external sources
-        if len(video_list) < limit:
-            external_videos = await video_apis.fetch_all_sources("science", limit - len(video_list))
-            
-            for video in external_videos:
-                video_data = {
-                    "id": video['id'],
-                    "title": video['title'],
-                    "channel": {
-                        "id": video['channel_id'],
-                        "name": video['channel_name']
-                    },
-                    "published": int(video['published'].timestamp() * 1000),
-                    "url": video['url'],
-                    "embedUrl": video['embed_url'],
-                    "thumbnail": video['thumbnail'],
-                    "category": video['category'],
-                    "isLive": video['is_live'],
-                    "duration": video['duration'],
-                    "viewCount": video.get('view_count', 0),
-                    "description": video['description'],
-                    "source": "external"
-                }
-                video_list.append(video_data)
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
         
-        return {
-            "success": True,
-            "data": video_list,
-            "total": len(video_list),
-            "category": "science"
-        }
+        return success_response(video_fragments.encode(video, ALL_FIELDS))
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error fetching science videos: {e}")
+        logger.error(f"Error fetching video {video_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
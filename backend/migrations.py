@@ -0,0 +1,252 @@
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, bindparam, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from database import engine as default_engine
+from leader_election import LeaderLock
+from models import Base, Category, Channel, DatasetVersion, Video, VideoCount, category_channels
+from video_store import rebuild_video_counts
+from video_time import epoch_ms, parse_duration
+
+logger = logging.getLogger(__name__)
+
+# Applied migrations are recorded here so each runs exactly once per database
+schema_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    schema_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# ALTER TABLE ... DROP COLUMN arrived in SQLite 3.35
+SQLITE_DROP_COLUMN = (3, 35, 0)
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = []
+
+def migration(version: int, description: str):
+    """Register an upgrade step; steps run in version order inside a transaction"""
+    def register(upgrade: Callable[[Connection], None]):
+        MIGRATIONS.append((version, description, upgrade))
+        return upgrade
+    return register
+
+@migration(1, "Composite (filter, published) indexes for list queries")
+def add_composite_video_indexes(connection: Connection):
+    for index in Video.__table__.indexes:
+        if index.name.endswith("_published") and len(index.columns) > 1:
+            index.create(connection, checkfirst=True)
+
+    # The composite indexes lead with these columns, so the single-column ones
+    # only cost writes now
+    for name in ("ix_videos_category", "ix_videos_is_live", "ix_videos_channel_id"):
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("ANALYZE videos"))
+
+@migration(2, "FTS5 full-text index over video title, description and channel")
+def add_video_search_index(connection: Connection):
+    if connection.dialect.name != "sqlite":
+        # Other databases fall back to ILIKE in video_queries.py
+        return
+
+    # External-content table: the text stays in videos, FTS5 only stores the
+    # index and reads rows back by rowid for snippets
+    connection.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5("
+        "title, description, channel_name, "
+        "content='videos', content_rowid='rowid', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    ))
+    connection.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_insert AFTER INSERT ON videos BEGIN "
+        "INSERT INTO videos_fts(rowid, title, description, channel_name) "
+        "VALUES (new.rowid, new.title, new.description, new.channel_name); "
+        "END"
+    ))
+    connection.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_delete AFTER DELETE ON videos BEGIN "
+        "INSERT INTO videos_fts(videos_fts, rowid, title, description, channel_name) "
+        "VALUES ('delete', old.rowid, old.title, old.description, old.channel_name); "
+        "END"
+    ))
+    connection.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_update "
+        "AFTER UPDATE OF title, description, channel_name ON videos BEGIN "
+        "INSERT INTO videos_fts(videos_fts, rowid, title, description, channel_name) "
+        "VALUES ('delete', old.rowid, old.title, old.description, old.channel_name); "
+        "INSERT INTO videos_fts(rowid, title, description, channel_name) "
+        "VALUES (new.rowid, new.title, new.description, new.channel_name); "
+        "END"
+    ))
+    # Title matches count most, then channel name, then description
+    connection.execute(text(
+        "INSERT INTO videos_fts(videos_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 4.0)')"
+    ))
+    connection.execute(text("INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')"))
+
+@migration(3, "Add id to the (filter, published) indexes for keyset pagination")
+def add_id_to_published_indexes(connection: Connection):
+    for index in Video.__table__.indexes:
+        if index.name.endswith("_published"):
+            connection.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+            index.create(connection)
+
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("ANALYZE videos"))
+
+@migration(4, "Maintained per-category, per-channel and live video counts")
+def add_video_counts(connection: Connection):
+    VideoCount.__table__.create(connection, checkfirst=True)
+    rebuild_video_counts(connection)
+
+@migration(5, "Move Category.channels into the category_channels join table")
+def normalize_category_channels(connection: Connection):
+    category_channels.create(connection, checkfirst=True)
+    known_categories = set(connection.execute(select(Category.id)).scalars())
+    known_channels = set(connection.execute(select(Channel.id)).scalars())
+
+    # Each channel's own category, plus whatever the old comma-separated
+    # column listed
+    links = set(connection.execute(select(Channel.category, Channel.id)).tuples())
+    has_csv_column = "channels" in {column["name"] for column in inspect(connection).get_columns("categories")}
+    if has_csv_column:
+        for category_id, channels in connection.execute(text("SELECT id, channels FROM categories")):
+            for channel_id in (channels or "").split(","):
+                if channel_id.strip():
+                    links.add((category_id, channel_id.strip()))
+
+    rows = [
+        {"category_id": category_id, "channel_id": channel_id}
+        for category_id, channel_id in sorted(links)
+        if category_id in known_categories and channel_id in known_channels
+    ]
+    existing = set(connection.execute(select(category_channels.c.category_id, category_channels.c.channel_id)).tuples())
+    rows = [row for row in rows if (row["category_id"], row["channel_id"]) not in existing]
+    if rows:
+        connection.execute(category_channels.insert(), rows)
+
+    if not has_csv_column:
+        return
+    if connection.dialect.name == "sqlite" and sqlite3.sqlite_version_info < SQLITE_DROP_COLUMN:
+        # The column is nullable and nothing reads it any more, so it can stay
+        logger.info(
+            f"SQLite {sqlite3.sqlite_version} can't drop columns; leaving the unused categories.channels in place"
+        )
+        return
+    connection.execute(text("ALTER TABLE categories DROP COLUMN channels"))
+
+@migration(6, "Integer published_ms and duration_seconds columns")
+def add_numeric_time_columns(connection: Connection):
+    columns = {column["name"] for column in inspect(connection).get_columns("videos")}
+    if "published_ms" not in columns:
+        connection.execute(text("ALTER TABLE videos ADD COLUMN published_ms BIGINT"))
+    if "duration_seconds" not in columns:
+        connection.execute(text("ALTER TABLE videos ADD COLUMN duration_seconds INTEGER"))
+    # Migration 8 replaces the ix_videos_duration_seconds index this created
+
+    # Backfilled in Python so published_ms matches what the API always sent
+    # (datetime.timestamp() of the stored naive datetime)
+    videos = Video.__table__
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            select(videos.c.id, videos.c.published, videos.c.duration)
+            .where(videos.c.id > last_id)
+            .order_by(videos.c.id)
+            .limit(5000)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        connection.execute(
+            videos.update().where(videos.c.id == bindparam("video_id")).values(
+                published_ms=bindparam("published_ms"),
+                duration_seconds=bindparam("duration_seconds")
+            ),
+            [
+                {
+                    "video_id": row.id,
+                    "published_ms": epoch_ms(row.published),
+                    "duration_seconds": parse_duration(row.duration)
+                }
+                for row in rows
+            ]
+        )
+
+@migration(7, "Dataset version counters for ETags")
+def add_dataset_versions(connection: Connection):
+    DatasetVersion.__table__.create(connection, checkfirst=True)
+    # Start from the current time so ETags from an older copy of the database never match
+    existing = set(connection.execute(select(DatasetVersion.name)).scalars())
+    rows = [
+        {"name": name, "version": epoch_ms(datetime.utcnow())}
+        for name in ["videos", "catalog"] + [
+            f"videos:{category}" for category in connection.execute(select(Video.category).distinct()).scalars()
+        ]
+        if name not in existing
+    ]
+    if rows:
+        connection.execute(DatasetVersion.__table__.insert(), rows)
+
+@migration(8, "Serve duration ranges from the published index instead of sorting")
+def add_duration_to_published_index(connection: Connection):
+    # SQLite guesses any two-sided range is selective, so it read duration
+    # ranges through their own index and sorted every match by published;
+    # a wide range then sorted most of the table for one page
+    connection.execute(text("DROP INDEX IF EXISTS ix_videos_duration_seconds"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_videos_published"))
+    for index in Video.__table__.indexes:
+        if index.name == "ix_videos_published":
+            index.create(connection)
+
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("ANALYZE videos"))
+
+def rebuild_search_index(connection: Connection):
+    """Re-index every video; needed after VACUUM, which may renumber rowids"""
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')"))
+
+def run_migrations(engine: Engine = default_engine, lock_path: Optional[str] = None):
+    """Create missing tables and apply any migrations this database hasn't seen yet.
+
+    Processes sharing lock_path migrate one at a time, so workers starting
+    together don't race each other's ALTER TABLE and CREATE INDEX steps.
+    """
+    if lock_path is None:
+        _apply_migrations(engine)
+        return
+    with LeaderLock(lock_path, retry_interval=0.1).held():
+        _apply_migrations(engine)
+
+def _apply_migrations(engine: Engine):
+    Base.metadata.create_all(bind=engine)
+    schema_metadata.create_all(bind=engine)
+
+    with engine.connect() as connection:
+        applied = set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+    for version, description, upgrade in sorted(MIGRATIONS, key=lambda step: step[0]):
+        if version in applied:
+            continue
+        try:
+            with engine.begin() as connection:
+                upgrade(connection)
+                connection.execute(schema_migrations.insert().values(
+                    version=version,
+                    description=description,
+                    applied_at=datetime.utcnow()
+                ))
+        except IntegrityError:
+            # A process outside lock_path (or without one) applied it first
+            logger.info(f"Migration {version} already applied by another process")
+            continue
+        logger.info(f"Applied migration {version}: {description}")
@@ -1,29 +1,61 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Integer, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, BigInteger, Text, ForeignKey, Index, Table
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 
 Base = declarative_base()
 
 class Video(Base):
     __tablename__ = "videos"
+    __table_args__ = (
+        # List queries filter on one column and sort by newest first; id breaks
+        # ties so keyset pagination can seek straight to (published, id).
+        # duration_seconds lets min_duration/max_duration filter while walking
+        # the index in order, without a table lookup per skipped row.
+        Index("ix_videos_published", "published", "id", "duration_seconds"),
+        Index("ix_videos_category_published", "category", "published", "id"),
+        Index("ix_videos_is_live_published", "is_live", "published", "id"),
+        Index("ix_videos_channel_id_published", "channel_id", "published", "id"),
+    )
     
     id = Column(String, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    channel_id = Column(String, nullable=False, index=True)
+    channel_id = Column(String, nullable=False)
     channel_name = Column(String, nullable=False)
-    published = Column(DateTime, nullable=False, index=True)
+    published = Column(DateTime, nullable=False)
+    published_ms = Column(BigInteger)  # published as epoch milliseconds, as the API sends it
     url = Column(String, nullable=False)
     embed_url = Column(String, nullable=False)
     thumbnail = Column(String, nullable=False)
-    category = Column(String, nullable=False, index=True)
-    is_live = Column(Boolean, default=False, index=True)
+    category = Column(String, nullable=False)
+    is_live = Column(Boolean, default=False)
     duration = Column(String)
+    duration_seconds = Column(Integer)
     view_count = Column(Integer)
-    description = Column(Text)
+    # Only the single-video endpoint needs it; list queries never load it
+    description = deferred(Column(Text))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class VideoCount(Base):
+    """Number of videos per facet value, maintained by ingestion and retention"""
+    __tablename__ = "video_counts"
+
+    dimension = Column(String, primary_key=True)  # "all", "category", "channel" or "is_live"
+    value = Column(String, primary_key=True)  # "" for "all", "true"/"false" for is_live
+    count = Column(Integer, nullable=False, default=0)
+
+class DatasetVersion(Base):
+    """Change counter per dataset, bumped in the same transaction as the change.
+
+    Datasets are "videos", "videos:<category>" and "catalog" (channels and
+    categories); the API derives ETags from them.
+    """
+    __tablename__ = "dataset_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+
 class Channel(Base):
     __tablename__ = "channels"
     
@@ -36,12 +68,21 @@ class Channel(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+# Which channels belong to which categories; the primary key serves
+# category -> channels lookups and the index serves channel -> categories
+category_channels = Table(
+    "category_channels",
+    Base.metadata,
+    Column("category_id", String, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True),
+    Column("channel_id", String, ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_category_channels_channel_id", "channel_id"),
+)
+
 class Category(Base):
     __tablename__ = "categories"
     
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
     color = Column(String, nullable=False)
-    channels = Column(Text)  # Comma-separated channel IDs
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
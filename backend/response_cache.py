@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+# Entries are keyed on the dataset version, so another worker's change retires
+# them within DATASET_VERSION_TTL; this only bounds how long an unused page stays
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+class ResponseCache:
+    """TTL + LRU cache of encoded JSON response bodies.
+
+    Each entry is tagged with the category its response depends on, or None
+    when it spans every category, so writers can drop only what they changed.
+    Bodies are bytes, which makes the memory bound exact.
+    """
+
+    def __init__(
+        self,
+        ttl: float = RESPONSE_CACHE_TTL,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        enabled: bool = RESPONSE_CACHE_ENABLED
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        # key -> (expires_at, category, body), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[float, Optional[str], bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a response computed across one is not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict) -> Hashable:
+        """Key for an endpoint and its query parameters; unset parameters are ignored"""
+        return (endpoint, tuple(sorted((name, value) for name, value in params.items() if value is not None)))
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """The cached body for key, or None if absent or expired"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: Hashable, body: bytes, category: Optional[str], generation: int):
+        """Store body unless an invalidation happened since generation was read"""
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, category, body)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_categories(self, categories: Iterable[str]):
+        """Drop entries for these categories and every entry that spans all categories"""
+        categories = set(categories)
+        if not categories:
+            return
+        with self._lock:
+            self.generation += 1
+            stale = [
+                key for key, (_, category, _) in self._entries.items()
+                if category is None or category in categories
+            ]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable):
+        self._bytes -= len(self._entries.pop(key)[2])
+
+    def get_stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "maxEntries": self.max_entries,
+            "maxBytes": self.max_bytes,
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+response_cache = ResponseCache()
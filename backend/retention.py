@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Retention and compaction for the videos table
+Usage: python retention.py [--vacuum]
+
+Run without arguments for a single prune pass. --vacuum converts an existing
+SQLite database to incremental auto-vacuum (a one-off full VACUUM).
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from database import IS_SQLITE, SessionLocal, engine
+from dataset_version import dataset_versions
+from hot_index import hot_index
+from db_executor import run_in_db
+from models import Video
+from response_cache import response_cache
+from video_store import apply_count_deltas, bump_dataset_versions, count_deltas, video_datasets
+
+logger = logging.getLogger(__name__)
+
+RETENTION_ENABLED = os.getenv("RETENTION_ENABLED", "true").lower() == "true"
+RETENTION_INTERVAL = float(os.getenv("RETENTION_INTERVAL", "3600"))  # seconds between runs
+RETENTION_MAX_AGE_DAYS = float(os.getenv("RETENTION_MAX_AGE_DAYS", "30"))
+# Per-category overrides, e.g. "sports=7,world=14"
+RETENTION_CATEGORY_MAX_AGE_DAYS = os.getenv("RETENTION_CATEGORY_MAX_AGE_DAYS", "")
+RETENTION_KEEP_LIVE = os.getenv("RETENTION_KEEP_LIVE", "true").lower() == "true"
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+RETENTION_BATCH_PAUSE = float(os.getenv("RETENTION_BATCH_PAUSE", "0.05"))  # seconds; lets readers and ingestion in
+RETENTION_VACUUM_PAGES = int(os.getenv("RETENTION_VACUUM_PAGES", "5000"))  # pages freed per run; 0 frees all
+
+def parse_category_ages(spec: str) -> Dict[str, float]:
+    """Parse "sports=7,world=14" into {"sports": 7.0, "world": 14.0}"""
+    ages = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        category, _, days = item.partition("=")
+        try:
+            ages[category.strip()] = float(days)
+        except ValueError:
+            logger.error(f"Ignoring invalid retention override: {item}")
+    return ages
+
+def _sqlite_sizes(connection) -> Dict[str, int]:
+    page_size = connection.execute(text("PRAGMA page_size")).scalar()
+    return {
+        "fileBytes": connection.execute(text("PRAGMA page_count")).scalar() * page_size,
+        "freeBytes": connection.execute(text("PRAGMA freelist_count")).scalar() * page_size,
+    }
+
+class RetentionJob:
+    """Prunes old videos in small batches and compacts the database afterwards"""
+
+    def __init__(
+        self,
+        max_age_days: float = RETENTION_MAX_AGE_DAYS,
+        category_max_age_days: Optional[Dict[str, float]] = None,
+        keep_live: bool = RETENTION_KEEP_LIVE,
+        batch_size: int = RETENTION_BATCH_SIZE,
+        batch_pause: float = RETENTION_BATCH_PAUSE,
+        interval: float = RETENTION_INTERVAL
+    ):
+        self.max_age_days = max_age_days
+        self.category_max_age_days = (
+            parse_category_ages(RETENTION_CATEGORY_MAX_AGE_DAYS)
+            if category_max_age_days is None else category_max_age_days
+        )
+        self.keep_live = keep_live
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.interval = interval
+        self.running = False
+        self.last_run: Optional[Dict] = None
+        self.total_pruned = 0
+
+    def _policies(self, now: datetime) -> List[Dict]:
+        """One (category filter, cutoff) pair per age limit"""
+        policies = [
+            {"category": category, "cutoff": now - timedelta(days=days)}
+            for category, days in self.category_max_age_days.items()
+        ]
+        policies.append({
+            "exclude": list(self.category_max_age_days),
+            "cutoff": now - timedelta(days=self.max_age_days)
+        })
+        return policies
+
+    def _prune_batch(self, policy: Dict) -> Dict[str, int]:
+        """Delete up to batch_size expired videos in one short transaction.
+
+        Returns pruned rows per category; counters are updated in the same
+        transaction and the FTS triggers drop the matching index entries.
+        """
+        db = SessionLocal()
+        try:
+            query = db.query(Video.id, Video.category, Video.channel_id, Video.is_live).filter(
+                Video.published < policy["cutoff"]
+            )
+            if "category" in policy:
+                query = query.filter(Video.category == policy["category"])
+            elif policy["exclude"]:
+                query = query.filter(Video.category.notin_(policy["exclude"]))
+            if self.keep_live:
+                query = query.filter(Video.is_live == False)
+            rows = query.order_by(Video.published).limit(self.batch_size).all()
+            if not rows:
+                return {}
+
+            db.query(Video).filter(Video.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+            apply_count_deltas(db, count_deltas(
+                ({"category": row.category, "channel_id": row.channel_id, "is_live": row.is_live} for row in rows),
+                sign=-1
+            ))
+            categories = {row.category for row in rows}
+            bump_dataset_versions(db, video_datasets(categories))
+            db.commit()
+            dataset_versions.invalidate()
+            response_cache.invalidate_categories(categories)
+            hot_index.refresh_categories(categories)
+
+            pruned = {}
+            for row in rows:
+                pruned[row.category] = pruned.get(row.category, 0) + 1
+            return pruned
+
+        except Exception as e:
+            logger.error(f"Error pruning videos: {e}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _compact(self) -> Dict[str, int]:
+        """Return freed pages to the filesystem and refresh planner statistics"""
+        if not IS_SQLITE:
+            return {}
+
+        with engine.connect() as connection:
+            before = _sqlite_sizes(connection)
+            if connection.execute(text("PRAGMA auto_vacuum")).scalar() == 2:  # INCREMENTAL
+                pages = f"({RETENTION_VACUUM_PAGES})" if RETENTION_VACUUM_PAGES > 0 else ""
+                # sqlite3's execute() steps a statement once, freeing a single
+                # page; executescript() runs it to completion
+                connection.connection.driver_connection.executescript(f"PRAGMA incremental_vacuum{pages};")
+            else:
+                logger.info("auto_vacuum is off; freed pages are reused but not returned (run retention.py --vacuum once)")
+            # Merge FTS segments left fragmented by the deletes, then let
+            # SQLite re-ANALYZE whatever changed enough to matter
+            connection.execute(text("INSERT INTO videos_fts(videos_fts, rank) VALUES ('merge', 500)"))
+            connection.execute(text("PRAGMA optimize"))
+            connection.commit()
+            after = _sqlite_sizes(connection)
+
+        return {
+            "bytesReclaimed": before["fileBytes"] - after["fileBytes"],
+            "fileBytes": after["fileBytes"],
+            "freeBytes": after["freeBytes"]
+        }
+
+    async def run_once(self) -> Dict:
+        """Prune everything the policy expires, then compact; returns a report"""
+        start = time.perf_counter()
+        pruned: Dict[str, int] = {}
+        for policy in self._policies(datetime.utcnow()):
+            while True:
+                batch = await run_in_db(self._prune_batch, policy)
+                for category, count in batch.items():
+                    pruned[category] = pruned.get(category, 0) + count
+                if sum(batch.values()) < self.batch_size:
+                    break
+                await asyncio.sleep(self.batch_pause)
+
+        report = {
+            "ranAt": datetime.utcnow().isoformat(),
+            "rowsPruned": sum(pruned.values()),
+            "rowsPrunedByCategory": pruned,
+            **await run_in_db(self._compact),
+        }
+        report["durationSeconds"] = round(time.perf_counter() - start, 3)
+
+        self.last_run = report
+        self.total_pruned += report["rowsPruned"]
+        logger.info(
+            f"Retention pruned {report['rowsPruned']} videos and reclaimed "
+            f"{report.get('bytesReclaimed', 0)} bytes in {report['durationSeconds']}s"
+        )
+        return report
+
+    async def start(self):
+        """Run the retention job every interval until stopped"""
+        self.running = True
+        logger.info("Starting retention job")
+        while self.running:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Error in retention job: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stop(self):
+        """Stop the retention job after the current run"""
+        self.running = False
+
+    def get_stats(self) -> Dict:
+        return {
+            "enabled": RETENTION_ENABLED,
+            "maxAgeDays": self.max_age_days,
+            "categoryMaxAgeDays": self.category_max_age_days,
+            "keepLive": self.keep_live,
+            "totalPruned": self.total_pruned,
+            "lastRun": self.last_run
+        }
+
+def convert_to_incremental_vacuum():
+    """Switch an existing SQLite database to incremental auto-vacuum.
+
+    Rewrites the whole file, so run it while the API is stopped. VACUUM may
+    renumber rowids, so the search index is rebuilt afterwards.
+    """
+    from migrations import rebuild_search_index
+
+    with engine.connect() as connection:
+        before = _sqlite_sizes(connection)
+        connection.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        connection.exec_driver_sql("VACUUM")
+    with engine.begin() as connection:
+        rebuild_search_index(connection)
+    with engine.connect() as connection:
+        after = _sqlite_sizes(connection)
+    print(f"Vacuumed: {before['fileBytes']} -> {after['fileBytes']} bytes")
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune and compact the videos table")
+    parser.add_argument("--vacuum", action="store_true", help="one-off full VACUUM into incremental auto-vacuum mode")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.vacuum:
+        convert_to_incremental_vacuum()
+        return
+    print(asyncio.run(RetentionJob().run_once()))
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,106 @@
 import asyncio
-import feedparser
+import hashlib
 import httpx
 import re
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
+import os
 import time
 
+from circuit_breaker import CircuitBreaker, parse_retry_after
 from database import SessionLocal
-from models import Video, Channel, Category
+from dataset_version import dataset_versions
+from db_executor import run_in_db
+from dedup_index import SeenIndex
+from feed_parser import get_parser_executor, parse_feed_entries, shutdown_parser_executor
+from http_client import get_http_client
+from ingestion_pipeline import IngestionPipeline, PipelineStage
+from scheduler import AdaptiveScheduler
+from video_store import bump_dataset_versions, upsert_videos
+from models import Channel, Category
+from category_map import category_channel_map, link_channels
+from video_fields import video_data_to_dict
+from video_time import epoch_ms, format_duration, parse_duration
 from websocket_manager import WebSocketManager
 
 logger = logging.getLogger(__name__)
 
+# Channel polling concurrency
+FETCH_CONCURRENTLY = os.getenv("RSS_FETCH_CONCURRENTLY", "true").lower() == "true"
+MAX_CONCURRENT_FETCHES = int(os.getenv("RSS_MAX_CONCURRENT_FETCHES", "10"))
+MAX_FETCHES_PER_HOST = int(os.getenv("RSS_MAX_FETCHES_PER_HOST", "6"))
+
+# Per-channel adaptive polling (intervals in seconds)
+ADAPTIVE_SCHEDULING = os.getenv("RSS_ADAPTIVE_SCHEDULING", "true").lower() == "true"
+FIXED_POLL_INTERVAL = 300
+MIN_POLL_INTERVAL = float(os.getenv("RSS_MIN_POLL_INTERVAL", "60"))
+MAX_POLL_INTERVAL = float(os.getenv("RSS_MAX_POLL_INTERVAL", "3600"))
+LIVE_POLL_INTERVAL = float(os.getenv("RSS_LIVE_POLL_INTERVAL", "60"))
+SCHEDULER_TICK = 5
+
+# Ingestion pipeline stages
+PIPELINE_QUEUE_SIZE = int(os.getenv("RSS_PIPELINE_QUEUE_SIZE", "100"))
+PARSE_CONCURRENCY = int(os.getenv("RSS_PARSE_CONCURRENCY", "2"))
+PERSIST_BATCH_SIZE = int(os.getenv("RSS_PERSIST_BATCH_SIZE", "20"))
+BROADCAST_CONCURRENCY = int(os.getenv("RSS_BROADCAST_CONCURRENCY", "1"))
+SEEN_INDEX_SIZE = int(os.getenv("RSS_SEEN_INDEX_SIZE", "100000"))
+
+# Per-channel circuit breaker (backoff in seconds)
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("RSS_BREAKER_FAILURE_THRESHOLD", "3"))
+BREAKER_BASE_BACKOFF = float(os.getenv("RSS_BREAKER_BASE_BACKOFF", "60"))
+BREAKER_MAX_BACKOFF = float(os.getenv("RSS_BREAKER_MAX_BACKOFF", "3600"))
+
 class RSSFetcher:
-    def __init__(self):
+    def __init__(self, websocket_manager: Optional[WebSocketManager] = None):
         self.running = False
-        self.websocket_manager = WebSocketManager()
+        self.websocket_manager = websocket_manager or WebSocketManager()
         self.channels = self._get_default_channels()
+        self.poll_channels = self._unique_channels(self.channels)
         self.categories = self._get_default_categories()
         
+        # Per-host limits are created lazily so they bind to the running loop
+        self.fetch_concurrently = FETCH_CONCURRENTLY
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        
+        # Per-channel health, so dead or throttled feeds stop costing capacity
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=BREAKER_FAILURE_THRESHOLD,
+            base_backoff=BREAKER_BASE_BACKOFF,
+            max_backoff=BREAKER_MAX_BACKOFF
+        )
+        
+        # Stored video IDs, so unchanged entries never reach the database
+        self.seen_index = SeenIndex(max_entries=SEEN_INDEX_SIZE)
+        
+        # Fetch, parse, dedupe, persist and broadcast run as separate stages
+        self.pipeline = self._build_pipeline()
+        
+        # Channels are polled when due rather than on one fixed cycle
+        self.adaptive_scheduling = ADAPTIVE_SCHEDULING
+        self.scheduler = AdaptiveScheduler(
+            min_interval=MIN_POLL_INTERVAL,
+            max_interval=MAX_POLL_INTERVAL,
+            default_interval=FIXED_POLL_INTERVAL,
+            live_interval=LIVE_POLL_INTERVAL
+        )
+        # Channels given a next poll time this cycle; the rest go back on the schedule
+        self._rescheduled_ids = set()
+        
+        # Conditional GET validators per channel: etag, last_modified and content_hash.
+        # A new body's validators stay pending until its videos are persisted, so a
+        # failed parse or write is retried on the next poll instead of cached away
+        self.feed_validators: Dict[str, Dict[str, Optional[str]]] = {}
+        self._pending_validators: Dict[str, Dict[str, Optional[str]]] = {}
+        self._cache_counters = self._new_cache_counters()
+        
+        # Timings of the most recent fetch cycle
+        self.last_cycle_stats: Dict = {}
+        self._channel_latency: Dict[str, Optional[float]] = {}
+        self._cycle_seen_ids = set()
+        self._cycle_counts: Dict[str, int] = {}
+        
     def _get_default_channels(self) -> List[Dict]:
         """Default news channels with their RSS feeds"""
         return [
@@ -170,6 +250,22 @@ class RSSFetcher:
             }
         ]
     
+    def _unique_channels(self, channels: List[Dict]) -> List[Dict]:
+        """One entry per channel ID, for polling.
+
+        A channel listed under two categories has one feed, so it is polled once
+        under its first entry; seeding still links it to every category.
+        """
+        unique: Dict[str, Dict] = {}
+        for channel in channels:
+            first = unique.setdefault(channel['id'], channel)
+            if first is not channel:
+                logger.warning(
+                    f"Channel {channel['id']} is configured as both '{first['name']}' ({first['category']}) "
+                    f"and '{channel['name']}' ({channel['category']}); polling it once as '{first['name']}'"
+                )
+        return list(unique.values())
+
     def _get_default_categories(self) -> List[Dict]:
         """Default categories"""
         return [
@@ -196,38 +292,6 @@ class RSSFetcher:
                 return match.group(1)
         return None
 
-    def _parse_duration(self, duration_str: str) -> str:
-        """Parse ISO 8601 duration to readable format"""
-        if not duration_str:
-            return ""
-        
-        # Remove PT prefix and parse
-        duration = duration_str.replace('PT', '')
-        
-        hours = 0
-        minutes = 0
-        seconds = 0
-        
-        # Extract hours
-        if 'H' in duration:
-            hours = int(duration.split('H')[0])
-            duration = duration.split('H')[1]
-        
-        # Extract minutes
-        if 'M' in duration:
-            minutes = int(duration.split('M')[0])
-            duration = duration.split('M')[1]
-        
-        # Extract seconds
-        if 'S' in duration:
-            seconds = int(duration.split('S')[0])
-        
-        # Format output
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{seconds:02d}"
-        else:
-            return f"{minutes}:{seconds:02d}"
-
     def _is_live_video(self, title: str, description: str) -> bool:
         """Check if video is live based on title and description"""
         live_indicators = [
@@ -238,95 +302,133 @@ class RSSFetcher:
         text = (title + ' ' + description).lower()
         return any(indicator in text for indicator in live_indicators)
 
-    async def _fetch_rss_feed(self, channel: Dict) -> List[Dict]:
-        """Fetch and parse RSS feed for a channel"""
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(channel['rss_url'])
-                response.raise_for_status()
-                
-                feed = feedparser.parse(response.content)
-                videos = []
-                
-                for entry in feed.entries[:10]:  # Get latest 10 videos
-                    video_id = self._extract_video_id(entry.link)
-                    if not video_id:
-                        continue
-                    
-                    # Parse published date
-                    published = datetime(*entry.published_parsed[:6])
-                    
-                    # Check if video is recent (within last 24 hours)
-                    if datetime.now() - published > timedelta(hours=24):
-                        continue
-                    
-                    # Extract duration from media content
-                    duration = ""
-                    if hasattr(entry, 'media_content') and entry.media_content:
-                        duration = self._parse_duration(entry.media_content[0].get('duration', ''))
-                    
-                    # Check if video is live
-                    is_live = self._is_live_video(entry.title, entry.get('summary', ''))
-                    
-                    video_data = {
-                        'id': f"yt:video:{video_id}",
-                        'title': entry.title,
-                        'channel_id': channel['id'],
-                        'channel_name': channel['name'],
-                        'published': published,
-                        'url': entry.link,
-                        'embed_url': f"https://www.youtube.com/embed/{video_id}",
-                        'thumbnail': f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
-                        'category': channel['category'],
-                        'is_live': is_live,
-                        'duration': duration,
-                        'description': entry.get('summary', '')
-                    }
-                    
-                    videos.append(video_data)
-                
-                return videos
-                
-        except Exception as e:
-            logger.error(f"Error fetching RSS feed for {channel['name']}: {e}")
-            return []
+    def _new_cache_counters(self) -> Dict[str, int]:
+        """Per-cycle counters for the conditional GET cache"""
+        return {"not_modified": 0, "unchanged_content": 0, "misses": 0}
 
-    async def _save_video(self, video_data: Dict) -> bool:
-        """Save video to database if it doesn't exist"""
-        try:
-            db = SessionLocal()
+    def _conditional_headers(self, channel_id: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from stored validators"""
+        validators = self.feed_validators.get(channel_id, {})
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def _commit_validators(self, channel_id: str):
+        """Keep a channel's pending validators now that its feed is fully ingested"""
+        validators = self._pending_validators.pop(channel_id, None)
+        if validators is not None:
+            self.feed_validators[channel_id] = validators
+
+    def _discard_validators(self, channel_id: str):
+        """Forget a channel's pending validators so the next poll downloads the feed again"""
+        self._pending_validators.pop(channel_id, None)
+
+    async def _download_feed(self, channel: Dict) -> Optional[bytes]:
+        """Download a channel's feed.
+
+        Returns None when the feed hasn't changed since the last ingested fetch
+        (304 Not Modified or an identical body), so it can skip parsing entirely.
+        A changed body's validators are pending until _commit_validators().
+        """
+        client = get_http_client()
+        response = await client.get(
+            channel['rss_url'],
+            headers=self._conditional_headers(channel['id'])
+        )
+        
+        if response.status_code == 304:
+            self._cache_counters['not_modified'] += 1
+            return None
+        
+        response.raise_for_status()
+        
+        # Servers without validators still let us skip parsing an identical body
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        previous = self.feed_validators.get(channel['id'], {})
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': content_hash
+        }
+        
+        if previous.get('content_hash') == content_hash:
+            # This exact body was already ingested, so its new validators are safe to keep
+            self.feed_validators[channel['id']] = validators
+            self._cache_counters['unchanged_content'] += 1
+            return None
+        
+        self._pending_validators[channel['id']] = validators
+        self._cache_counters['misses'] += 1
+        return response.content
+
+    async def _parse_feed(self, channel: Dict, content: bytes) -> List[Dict]:
+        """Parse a channel's feed into recent video records"""
+        # XML parsing runs in the parser pool so it doesn't block the event loop
+        loop = asyncio.get_running_loop()
+        entries = await loop.run_in_executor(get_parser_executor(), parse_feed_entries, content)
+        videos = []
+        
+        for entry in entries:  # Latest 10 videos
+            video_id = self._extract_video_id(entry['link'])
+            if not video_id:
+                continue
             
-            # Check if video already exists
-            existing_video = db.query(Video).filter(Video.id == video_data['id']).first()
-            if existing_video:
-                return False
+            published = entry['published']
             
-            # Create new video
-            video = Video(**video_data)
-            db.add(video)
-            db.commit()
+            # Check if video is recent (within last 24 hours)
+            if datetime.now() - published > timedelta(hours=24):
+                continue
             
-            logger.info(f"Saved new video: {video_data['title']}")
-            return True
+            duration_seconds = parse_duration(entry['duration'])
             
-        except Exception as e:
-            logger.error(f"Error saving video: {e}")
-            db.rollback()
-            return False
-        finally:
-            db.close()
+            # Check if video is live
+            is_live = self._is_live_video(entry['title'], entry['description'])
+            
+            video_data = {
+                'id': f"yt:video:{video_id}",
+                'title': entry['title'],
+                'channel_id': channel['id'],
+                'channel_name': channel['name'],
+                'published': published,
+                'published_ms': epoch_ms(published),
+                'url': entry['link'],
+                'embed_url': f"https://www.youtube.com/embed/{video_id}",
+                'thumbnail': f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+                'category': channel['category'],
+                'is_live': is_live,
+                'duration': format_duration(duration_seconds),
+                'duration_seconds': duration_seconds,
+                'description': entry['description']
+            }
+            
+            videos.append(video_data)
+        
+        return videos
 
-    async def _initialize_database(self):
-        """Initialize database with default channels and categories"""
+    async def _save_videos(self, videos: List[Dict]) -> List[Dict]:
+        """Save a batch of videos in one transaction and return the new ones"""
+        # The commit runs in the DB pool so a slow write doesn't stall fetches
+        return await run_in_db(upsert_videos, videos)
+
+    def _seed_defaults(self):
+        """Add default channels and categories that aren't stored yet"""
         try:
             db = SessionLocal()
             
-            # Add default channels
+            # Add default channels; an ID listed under two categories is stored
+            # once and linked to both below
+            added = set()
             for channel_data in self.channels:
+                if channel_data['id'] in added:
+                    continue
                 existing_channel = db.query(Channel).filter(Channel.id == channel_data['id']).first()
                 if not existing_channel:
                     channel = Channel(**channel_data)
                     db.add(channel)
+                    added.add(channel_data['id'])
             
             # Add default categories
             for category_data in self.categories:
@@ -334,8 +436,16 @@ class RSSFetcher:
                 if not existing_category:
                     category = Category(**category_data)
                     db.add(category)
+            db.flush()
+            
+            # Each default channel belongs to its own category
+            link_channels(db, ((channel_data['category'], channel_data['id']) for channel_data in self.channels))
+            # Cheaper than working out whether any link was new; seeding runs once per start
+            bump_dataset_versions(db, ["catalog"])
             
             db.commit()
+            dataset_versions.invalidate()
+            category_channel_map.invalidate()
             logger.info("Database initialized with default channels and categories")
             
         except Exception as e:
@@ -344,39 +454,221 @@ class RSSFetcher:
         finally:
             db.close()
 
-    async def _fetch_all_channels(self):
-        """Fetch videos from all channels"""
-        for channel in self.channels:
+    async def _initialize_database(self):
+        """Initialize database with default channels and categories"""
+        await run_in_db(self._seed_defaults)
+        
+        # Known videos are skipped before they reach the database
+        await run_in_db(self.seen_index.warm)
+
+    def _get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore limiting concurrent requests to a feed's host"""
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(MAX_FETCHES_PER_HOST)
+        return self._host_semaphores[host]
+
+    def _reschedule(self, channel: Dict, videos: List[Dict]):
+        """Feed a poll result back into the adaptive scheduler"""
+        if not self.adaptive_scheduling:
+            return
+        # An empty result (unchanged feed or error) says nothing about live status
+        has_live = any(video['is_live'] for video in videos) if videos else None
+        self.scheduler.record_poll(channel['id'], [video['published'] for video in videos], has_live)
+        self._rescheduled_ids.add(channel['id'])
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        """Seconds a 429 response asked us to wait, if any"""
+        if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+            retry_after = parse_retry_after(error.response.headers.get('Retry-After'))
+            # A 429 without a usable Retry-After still opens the circuit
+            return retry_after if retry_after is not None else 0.0
+        return None
+
+    async def _fetch_stage(self, channels: List[Dict]) -> List[Tuple[Dict, bytes]]:
+        """Pipeline stage: download changed feeds within the per-host limits"""
+        downloaded = []
+        for channel in channels:
+            # Channels with an open circuit don't cost a request or a connection slot
+            if not self.circuit_breaker.allow_request(channel['id']):
+                self._cycle_counts['skipped_channels'] += 1
+                self._reschedule(channel, [])
+                continue
+            
+            fetch_start = time.perf_counter()
             try:
-                videos = await self._fetch_rss_feed(channel)
-                
-                for video_data in videos:
-                    is_new = await self._save_video(video_data)
-                    
-                    if is_new:
-                        # Broadcast new video to WebSocket clients
-                        await self.websocket_manager.broadcast_new_video({
-                            "id": video_data['id'],
-                            "title": video_data['title'],
-                            "channel": {
-                                "id": video_data['channel_id'],
-                                "name": video_data['channel_name']
-                            },
-                            "published": int(video_data['published'].timestamp() * 1000),
-                            "url": video_data['url'],
-                            "embedUrl": video_data['embed_url'],
-                            "thumbnail": video_data['thumbnail'],
-                            "category": video_data['category'],
-                            "isLive": video_data['is_live'],
-                            "duration": video_data['duration'],
-                            "description": video_data['description']
-                        })
-                
+                async with self._get_host_semaphore(channel['rss_url']):
+                    content = await self._download_feed(channel)
+                self._channel_latency[channel['id']] = time.perf_counter() - fetch_start
+                if content is None:
+                    # 304 or an unchanged body: the feed is up and already ingested
+                    self.circuit_breaker.record_success(channel['id'])
+            except Exception as e:
+                logger.error(f"Error fetching RSS feed for {channel['name']}: {e}")
+                self._channel_latency[channel['id']] = None
+                self.circuit_breaker.record_failure(channel['id'], str(e), self._retry_after(e))
+                content = None
+            
+            if content is None:
+                self._reschedule(channel, [])
+            else:
+                # A new body only counts as healthy once the parse stage reads it
+                downloaded.append((channel, content))
+            
+            if not self.fetch_concurrently:
                 # Small delay between channels to be respectful
                 await asyncio.sleep(1)
-                
+        return downloaded
+
+    async def _parse_stage(self, feeds: List[Tuple[Dict, bytes]]) -> List[List[Dict]]:
+        """Pipeline stage: turn feed bodies into per-channel lists of videos"""
+        parsed = []
+        for channel, content in feeds:
+            try:
+                videos = await self._parse_feed(channel, content)
             except Exception as e:
-                logger.error(f"Error processing channel {channel['name']}: {e}")
+                logger.error(f"Error parsing RSS feed for {channel['name']}: {e}")
+                self.circuit_breaker.record_failure(channel['id'], str(e))
+                self._discard_validators(channel['id'])
+                self._reschedule(channel, [])
+                continue
+            self.circuit_breaker.record_success(channel['id'])
+            self._reschedule(channel, videos)
+            if videos:
+                parsed.append(videos)
+            else:
+                # Nothing recent to store, so the feed is fully handled
+                self._commit_validators(channel['id'])
+        return parsed
+
+    async def _dedupe_stage(self, batches: List[List[Dict]]) -> List[List[Dict]]:
+        """Pipeline stage: drop repeats within this cycle and videos already stored unchanged"""
+        unique = []
+        for videos in batches:
+            unique_before = len(unique)
+            for video_data in videos:
+                if video_data['id'] in self._cycle_seen_ids:
+                    continue
+                self._cycle_seen_ids.add(video_data['id'])
+                self._cycle_counts['fetched_videos'] += 1
+                if not self.seen_index.is_known(video_data):
+                    unique.append(video_data)
+            if len(unique) == unique_before:
+                # Every video is already stored, so there is nothing left to persist
+                self._commit_validators(videos[0]['channel_id'])
+        return [unique] if unique else []
+
+    async def _persist_stage(self, batches: List[List[Dict]]) -> List[Dict]:
+        """Pipeline stage: write several channels' videos in one transaction"""
+        videos = [video_data for batch in batches for video_data in batch]
+        channel_ids = {video_data['channel_id'] for video_data in videos}
+        try:
+            new_videos = await self._save_videos(videos)
+        except Exception:
+            for channel_id in channel_ids:
+                self._discard_validators(channel_id)
+            raise
+        # Everything in the batch is now stored with its current metadata
+        self.seen_index.add_many(videos)
+        for channel_id in channel_ids:
+            self._commit_validators(channel_id)
+        self._cycle_counts['new_videos'] += len(new_videos)
+        return new_videos
+
+    async def _broadcast_stage(self, videos: List[Dict]) -> List:
+        """Pipeline stage: announce new videos to WebSocket clients"""
+        await self._broadcast_new_videos(videos)
+        return []
+
+    def _build_pipeline(self) -> IngestionPipeline:
+        """Wire fetch -> parse -> dedupe -> persist -> broadcast with bounded queues"""
+        return IngestionPipeline([
+            PipelineStage(
+                "fetch", self._fetch_stage,
+                concurrency=MAX_CONCURRENT_FETCHES if self.fetch_concurrently else 1,
+                queue_size=PIPELINE_QUEUE_SIZE
+            ),
+            PipelineStage(
+                "parse", self._parse_stage,
+                concurrency=PARSE_CONCURRENCY, queue_size=PIPELINE_QUEUE_SIZE
+            ),
+            PipelineStage(
+                "dedupe", self._dedupe_stage,
+                concurrency=1, queue_size=PIPELINE_QUEUE_SIZE
+            ),
+            PipelineStage(
+                "persist", self._persist_stage,
+                concurrency=1, queue_size=PIPELINE_QUEUE_SIZE, batch_size=PERSIST_BATCH_SIZE
+            ),
+            PipelineStage(
+                "broadcast", self._broadcast_stage,
+                concurrency=BROADCAST_CONCURRENCY, queue_size=PIPELINE_QUEUE_SIZE,
+                batch_size=PERSIST_BATCH_SIZE
+            )
+        ])
+
+    async def _broadcast_new_videos(self, videos: List[Dict]):
+        """Broadcast new videos to WebSocket clients"""
+        for video_data in videos:
+            await self.websocket_manager.broadcast_new_video(video_data_to_dict(video_data))
+
+    async def _fetch_all_channels(self, channels: Optional[List[Dict]] = None):
+        """Fetch videos from the given channels (all channels by default)"""
+        if channels is None:
+            channels = self.poll_channels
+        
+        cycle_start = time.perf_counter()
+        self._channel_latency = {}
+        self._cycle_seen_ids = set()
+        self._cycle_counts = {"fetched_videos": 0, "new_videos": 0, "skipped_channels": 0}
+        self._cache_counters = self._new_cache_counters()
+        
+        await self.pipeline.run(channels)
+        channel_latency = self._channel_latency
+        
+        wall_time = time.perf_counter() - cycle_start
+        completed = [latency for latency in channel_latency.values() if latency is not None]
+        
+        cache_hits = self._cache_counters['not_modified'] + self._cache_counters['unchanged_content']
+        cache_lookups = cache_hits + self._cache_counters['misses']
+        
+        self.last_cycle_stats = {
+            "finished_at": datetime.utcnow().isoformat(),
+            "concurrent": self.fetch_concurrently,
+            "wall_time": round(wall_time, 3),
+            "channels": len(channels),
+            **self._cycle_counts,
+            "failed_channels": len(channel_latency) - len(completed),
+            "slowest_channel_latency": round(max(completed), 3) if completed else None,
+            "feed_cache": {
+                **self._cache_counters,
+                "hits": cache_hits,
+                "hit_rate": round(cache_hits / cache_lookups, 3) if cache_lookups else None,
+                "miss_rate": round(self._cache_counters['misses'] / cache_lookups, 3) if cache_lookups else None
+            },
+            "channel_latency": {
+                channel_id: round(latency, 3) if latency is not None else None
+                for channel_id, latency in channel_latency.items()
+            }
+        }
+        
+        logger.info(
+            f"Fetched {len(channels)} channels in {wall_time:.2f}s "
+            f"(slowest feed: {self.last_cycle_stats['slowest_channel_latency']}s, "
+            f"feed cache hits: {cache_hits}/{cache_lookups})"
+        )
+
+    def get_stats(self) -> Dict:
+        """Get ingestion statistics for the most recent fetch cycle"""
+        return {
+            "running": self.running,
+            "adaptiveScheduling": self.adaptive_scheduling,
+            "lastCycle": self.last_cycle_stats,
+            "pipeline": self.pipeline.get_stats(),
+            "seenIndex": self.seen_index.get_stats(),
+            "channelHealth": self.circuit_breaker.get_stats(),
+            "schedule": self.scheduler.get_stats() if self.adaptive_scheduling else {}
+        }
 
     async def start_fetching(self):
         """Start the RSS fetching loop"""
@@ -387,13 +679,44 @@ class RSSFetcher:
         
         logger.info("Starting RSS fetching loop")
         
+        if self.adaptive_scheduling:
+            await self._run_scheduled_fetching()
+            return
+        
         while self.running:
             try:
                 await self._fetch_all_channels()
                 logger.info("Completed RSS fetch cycle")
                 
                 # Wait 5 minutes before next fetch
-                await asyncio.sleep(300)
+                await asyncio.sleep(FIXED_POLL_INTERVAL)
+                
+            except Exception as e:
+                logger.error(f"Error in RSS fetching loop: {e}")
+                await asyncio.sleep(60)  # Wait 1 minute on error
+
+    async def _run_scheduled_fetching(self):
+        """Poll each channel when the adaptive scheduler says it is due"""
+        channels_by_id = {channel['id']: channel for channel in self.poll_channels}
+        for channel_id in channels_by_id:
+            self.scheduler.add_channel(channel_id)
+        
+        while self.running:
+            try:
+                due = self.scheduler.pop_due()
+                if due:
+                    self._rescheduled_ids = set()
+                    try:
+                        await self._fetch_all_channels([channels_by_id[channel_id] for channel_id in due])
+                    finally:
+                        # pop_due() took these off the schedule; a channel whose poll
+                        # never reached record_poll would otherwise not be polled again
+                        for channel_id in due:
+                            if channel_id not in self._rescheduled_ids:
+                                self.scheduler.add_channel(channel_id)
+                
+                wait = self.scheduler.seconds_until_next()
+                await asyncio.sleep(SCHEDULER_TICK if wait is None else min(wait, SCHEDULER_TICK))
                 
             except Exception as e:
                 logger.error(f"Error in RSS fetching loop: {e}")
@@ -402,4 +725,6 @@ class RSSFetcher:
     async def stop_fetching(self):
         """Stop the RSS fetching loop"""
         self.running = False
+        await self.pipeline.stop()
+        shutdown_parser_executor()
         logger.info("Stopping RSS fetching loop")
@@ -0,0 +1,133 @@
+import heapq
+import itertools
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+class AdaptiveScheduler:
+    """Priority queue of channels keyed by their next-due poll time.
+
+    Each channel's poll interval adapts to how often it publishes: channels
+    that post frequently (or are currently live) are polled more often, quiet
+    channels back off towards max_interval.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 60,
+        max_interval: float = 3600,
+        default_interval: float = 300,
+        live_interval: float = 60,
+        backoff_factor: float = 1.5,
+        history_size: int = 10
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.live_interval = live_interval
+        self.backoff_factor = backoff_factor
+        self.history_size = history_size
+
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._channels: Dict[str, Dict] = {}
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _push(self, channel_id: str, due: float):
+        self._channels[channel_id]['next_due'] = due
+        heapq.heappush(self._heap, (due, next(self._counter), channel_id))
+
+    def add_channel(self, channel_id: str, due: Optional[float] = None):
+        """Register a channel, due immediately unless a due time is given.
+
+        A known channel keeps its interval and history and is only put back on
+        the schedule, e.g. after pop_due() handed it to a poll that failed.
+        """
+        due = time.monotonic() if due is None else due
+        if channel_id in self._channels:
+            self._push(channel_id, due)
+            return
+        self._channels[channel_id] = {
+            'interval': self.default_interval,
+            'next_due': 0.0,
+            'has_live': False,
+            'publish_times': deque(maxlen=self.history_size)
+        }
+        self._push(channel_id, due)
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Remove and return every channel whose next poll is due"""
+        now = time.monotonic() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_time, _, channel_id = heapq.heappop(self._heap)
+            # Skip stale heap entries left behind by a reschedule
+            if self._channels[channel_id]['next_due'] != due_time:
+                continue
+            due.append(channel_id)
+        return due
+
+    def seconds_until_next(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the next channel is due, or None if nothing is scheduled"""
+        if not self._heap:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._heap[0][0] - now)
+
+    def _estimate_interval(self, publish_times: Deque[datetime]) -> Optional[float]:
+        """Poll at half the mean gap between a channel's recent uploads"""
+        if len(publish_times) < 2:
+            return None
+        ordered = sorted(publish_times)
+        span = (ordered[-1] - ordered[0]).total_seconds()
+        mean_gap = span / (len(ordered) - 1)
+        return mean_gap / 2
+
+    def record_poll(
+        self,
+        channel_id: str,
+        published: List[datetime],
+        has_live: Optional[bool] = None,
+        now: Optional[float] = None
+    ):
+        """Adapt a channel's interval from a poll result and schedule its next poll.
+
+        published holds the publish times of videos seen in this poll (empty when
+        the feed was unchanged); has_live is None when the feed wasn't parsed.
+        """
+        if channel_id not in self._channels:
+            self.add_channel(channel_id)
+        state = self._channels[channel_id]
+        now = time.monotonic() if now is None else now
+
+        new_times = [p for p in published if p not in state['publish_times']]
+        state['publish_times'].extend(new_times)
+        if has_live is not None:
+            state['has_live'] = has_live
+
+        if new_times:
+            estimate = self._estimate_interval(state['publish_times'])
+            interval = estimate if estimate is not None else state['interval']
+        else:
+            interval = state['interval'] * self.backoff_factor
+
+        if state['has_live']:
+            interval = min(interval, self.live_interval)
+
+        state['interval'] = self._clamp(interval)
+        self._push(channel_id, now + state['interval'])
+
+    def get_stats(self, now: Optional[float] = None) -> Dict:
+        """Current interval, live flag and time-to-next-poll per channel"""
+        now = time.monotonic() if now is None else now
+        return {
+            channel_id: {
+                'interval': round(state['interval'], 1),
+                'has_live': state['has_live'],
+                'due_in': round(max(0.0, state['next_due'] - now), 1)
+            }
+            for channel_id, state in self._channels.items()
+        }
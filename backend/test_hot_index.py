@@ -0,0 +1,82 @@
+"""
+Tests for patching the hot index from upserted rows
+"""
+
+from datetime import datetime, timedelta
+
+from hot_index import HOT_COLUMNS, HotBuffer, HotIndex, HotVideo
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+def row(number: int, category: str = "world", is_live: bool = False) -> dict:
+    values = {name: None for name in HOT_COLUMNS}
+    values.update({
+        "id": f"yt:video:{number:04d}",
+        "title": f"Video {number}",
+        "published": NOW - timedelta(minutes=number),
+        "category": category,
+        "is_live": is_live,
+        "updated_at": NOW
+    })
+    return values
+
+def index_with(**buffers) -> HotIndex:
+    index = HotIndex(size=3, enabled=True)
+    for name, (rows, total, version) in buffers.items():
+        index._buffers[name.replace("_", ":")] = HotBuffer(
+            (HotVideo.from_row(values) for values in rows), total, version, index.size
+        )
+    index.refreshed = []
+    index.refresh = index.refreshed.append
+    return index
+
+def ids(index: HotIndex, name: str) -> list:
+    return [video.id for video in index._buffers[name].videos]
+
+def test_inserted_rows_are_merged_newest_first():
+    index = index_with(all=([row(2), row(4)], 2, 10), category_world=([row(2), row(4)], 2, 5))
+
+    index.apply_upsert(
+        ["world"], [row(1), row(3)], {},
+        {("all", ""): 2, ("category", "world"): 2}, {"videos": 11, "videos:world": 6}
+    )
+
+    assert ids(index, "all") == ["yt:video:0001", "yt:video:0002", "yt:video:0003"]
+    assert index._buffers["all"].total == 4
+    assert index._buffers["all"].version == 11
+    assert ids(index, "category:world") == ids(index, "all")
+    assert index.refreshed == []
+
+def test_partial_buffer_keeps_older_inserts_out():
+    index = index_with(all=([row(1), row(2)], 5, 10))
+
+    index.apply_upsert(["world"], [row(9)], {}, {("all", ""): 1}, {"videos": 11})
+
+    # Rows between 2 and 9 were never loaded, so 9 can't be placed
+    assert ids(index, "all") == ["yt:video:0001", "yt:video:0002"]
+    assert index._buffers["all"].total == 6
+
+def test_updates_replace_entries_and_leave_the_live_buffer():
+    live = row(1, is_live=True)
+    index = index_with(all=([live, row(2)], 2, 10), live=([live], 1, 10))
+
+    index.apply_upsert(
+        ["world"], [], {live["id"]: {"is_live": False, "title": "Ended", "updated_at": NOW + timedelta(minutes=1)}},
+        {("is_live", "true"): -1, ("is_live", "false"): 1}, {"videos": 11}
+    )
+
+    assert index._buffers["all"].videos[0].title == "Ended"
+    assert ids(index, "live") == []
+    assert index._buffers["live"].total == 0
+    assert index.refreshed == []
+
+def test_buffers_reload_when_a_patch_cant_be_trusted():
+    index = index_with(all=([row(2)], 1, 7), live=([], 0, 10))
+
+    index.apply_upsert(
+        ["world"], [row(1)], {row(5)["id"]: {"is_live": True, "updated_at": NOW}},
+        {("all", ""): 1, ("is_live", "true"): 1, ("is_live", "false"): -1}, {"videos": 11}
+    )
+
+    # "all" missed a write in between; "live" gained a video it never held
+    assert sorted(index.refreshed) == ["all", "live"]
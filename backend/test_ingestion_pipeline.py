@@ -0,0 +1,349 @@
+"""
+Tests for the staged ingestion pipeline, driven by local fixture feeds
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import circuit_breaker
+import rss_fetcher
+from fixture_data import build_youtube_feed
+from ingestion_pipeline import IngestionPipeline, PipelineStage
+from rss_fetcher import RSSFetcher
+
+def channel(tag: str, category: str = "world") -> dict:
+    return {
+        "id": f"UC{tag}",
+        "name": f"Channel {tag}",
+        "category": category,
+        "rss_url": f"https://feeds.test/{tag}.xml"
+    }
+
+def channel_feed(tag: str, entries: int = 5) -> bytes:
+    """A fixture feed whose video IDs are unique to the channel"""
+    return build_youtube_feed(entries).replace(b"video0", f"{tag}0".encode())
+
+class FakeResponse:
+    def __init__(self, url: str, status_code: int, content: bytes = b"", headers: dict = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self._request = httpx.Request("GET", url)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise httpx.HTTPStatusError(
+                f"HTTP {self.status_code}", request=self._request,
+                response=httpx.Response(self.status_code, request=self._request)
+            )
+
+class FakeFeedServer:
+    """Serves fixture feeds by URL with an ETag per body, honouring If-None-Match"""
+
+    def __init__(self, feeds: dict):
+        self.feeds = feeds
+        self.requests = []
+
+    async def get(self, url: str, headers: dict = None):
+        self.requests.append(url)
+        content = self.feeds.get(url)
+        if content is None:
+            return FakeResponse(url, 500)
+        etag = f'"{hash(content)}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(url, 304)
+        return FakeResponse(url, 200, content, {"ETag": etag})
+
+class FakeWebSocketManager:
+    def __init__(self):
+        self.broadcasts = []
+
+    async def broadcast_new_video(self, video: dict):
+        self.broadcasts.append(video["id"])
+
+def start_cycle(fetcher: RSSFetcher):
+    """Reset the per-cycle state the way _fetch_all_channels does"""
+    fetcher._channel_latency = {}
+    fetcher._cycle_seen_ids = set()
+    fetcher._cycle_counts = {"fetched_videos": 0, "new_videos": 0, "skipped_channels": 0}
+    fetcher._cache_counters = fetcher._new_cache_counters()
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    monkeypatch.setattr(rss_fetcher, "ADAPTIVE_SCHEDULING", False)
+    fetcher = RSSFetcher(websocket_manager=FakeWebSocketManager())
+    fetcher.fetch_concurrently = True
+    fetcher.saved = []
+
+    async def save_videos(videos):
+        # Stands in for the database: every video is new
+        fetcher.saved.extend(videos)
+        return videos
+
+    monkeypatch.setattr(fetcher, "_save_videos", save_videos)
+    start_cycle(fetcher)
+    return fetcher
+
+def serve(monkeypatch, feeds: dict) -> FakeFeedServer:
+    server = FakeFeedServer(feeds)
+    monkeypatch.setattr(rss_fetcher, "get_http_client", lambda: server)
+    return server
+
+def test_fetch_stage_skips_unchanged_feeds_once_ingested(fetcher, monkeypatch):
+    bbc = channel("bbc")
+    serve(monkeypatch, {bbc["rss_url"]: channel_feed("bbc")})
+
+    downloaded = asyncio.run(fetcher._fetch_stage([bbc]))
+    assert [feed_channel["id"] for feed_channel, _ in downloaded] == [bbc["id"]]
+
+    # Not ingested yet, so the feed is downloaded again rather than cached away
+    assert len(asyncio.run(fetcher._fetch_stage([bbc]))) == 1
+
+    fetcher._commit_validators(bbc["id"])
+    assert asyncio.run(fetcher._fetch_stage([bbc])) == []
+    assert fetcher._cache_counters["not_modified"] == 1
+
+def test_fetch_stage_isolates_failing_channels(fetcher, monkeypatch):
+    bbc, broken = channel("bbc"), channel("broken")
+    serve(monkeypatch, {bbc["rss_url"]: channel_feed("bbc")})
+
+    downloaded = asyncio.run(fetcher._fetch_stage([broken, bbc]))
+
+    assert [feed_channel["id"] for feed_channel, _ in downloaded] == [bbc["id"]]
+    assert fetcher._channel_latency[broken["id"]] is None
+    assert fetcher.circuit_breaker.get_stats()[broken["id"]]["failures"] == 1
+
+def test_parse_stage_turns_feeds_into_videos(fetcher):
+    bbc = channel("bbc", category="world")
+
+    parsed = asyncio.run(fetcher._parse_stage([(bbc, channel_feed("bbc", entries=5))]))
+
+    assert len(parsed) == 1
+    videos = parsed[0]
+    assert len(videos) == 5
+    assert all(video["id"].startswith("yt:video:bbc0") for video in videos)
+    assert {video["category"] for video in videos} == {"world"}
+    assert {video["channel_id"] for video in videos} == {bbc["id"]}
+
+def test_parse_stage_isolates_feeds_that_fail_to_parse(fetcher, monkeypatch):
+    bbc, broken = channel("bbc"), channel("broken")
+    parse = rss_fetcher.parse_feed_entries
+
+    def parse_or_fail(content, *args):
+        if content == b"broken":
+            raise ValueError("not a feed")
+        return parse(content, *args)
+
+    monkeypatch.setattr(rss_fetcher, "parse_feed_entries", parse_or_fail)
+    fetcher._pending_validators[broken["id"]] = {"etag": '"1"', "last_modified": None, "content_hash": "1"}
+
+    parsed = asyncio.run(fetcher._parse_stage([(broken, b"broken"), (bbc, channel_feed("bbc"))]))
+
+    assert [videos[0]["channel_id"] for videos in parsed] == [bbc["id"]]
+    assert fetcher.circuit_breaker.get_stats()[broken["id"]]["failures"] == 1
+    # The next poll downloads the broken feed again
+    assert broken["id"] not in fetcher._pending_validators
+    assert broken["id"] not in fetcher.feed_validators
+
+def test_parse_failures_open_the_circuit(fetcher, monkeypatch):
+    broken = channel("broken")
+    serve(monkeypatch, {broken["rss_url"]: b"broken"})
+
+    def fail(content, *args):
+        raise ValueError("not a feed")
+
+    monkeypatch.setattr(rss_fetcher, "parse_feed_entries", fail)
+
+    async def poll():
+        await fetcher._parse_stage(await fetcher._fetch_stage([broken]))
+
+    for _ in range(fetcher.circuit_breaker.failure_threshold):
+        asyncio.run(poll())
+    assert fetcher.circuit_breaker.get_state(broken["id"]) == circuit_breaker.OPEN
+
+    # A half-open trial that downloads but still can't be parsed opens the circuit again
+    fetcher.circuit_breaker._channels[broken["id"]]["open_until"] = 0.0
+    asyncio.run(poll())
+    assert fetcher.circuit_breaker.get_state(broken["id"]) == circuit_breaker.OPEN
+    assert fetcher.circuit_breaker.get_stats()[broken["id"]]["successes"] == 0
+
+def test_dedupe_stage_drops_cycle_repeats_and_known_videos(fetcher):
+    bbc, cnn = channel("bbc"), channel("cnn")
+    bbc_videos = asyncio.run(fetcher._parse_stage([(bbc, channel_feed("bbc", entries=3))]))[0]
+    cnn_videos = asyncio.run(fetcher._parse_stage([(cnn, channel_feed("cnn", entries=3))]))[0]
+    fetcher.seen_index.add(cnn_videos[0])
+
+    first = asyncio.run(fetcher._dedupe_stage([bbc_videos, cnn_videos]))
+    again = asyncio.run(fetcher._dedupe_stage([bbc_videos]))
+
+    assert [video["id"] for video in first[0]] == [video["id"] for video in bbc_videos + cnn_videos[1:]]
+    assert again == []
+    assert fetcher._cycle_counts["fetched_videos"] == 6
+
+def test_persist_stage_writes_batches_and_commits_validators(fetcher):
+    bbc = channel("bbc")
+    videos = asyncio.run(fetcher._parse_stage([(bbc, channel_feed("bbc", entries=3))]))[0]
+    fetcher._pending_validators[bbc["id"]] = {"etag": '"1"', "last_modified": None, "content_hash": "1"}
+
+    new_videos = asyncio.run(fetcher._persist_stage([videos[:2], videos[2:]]))
+
+    assert [video["id"] for video in new_videos] == [video["id"] for video in videos]
+    assert fetcher.saved == videos
+    assert all(fetcher.seen_index.is_known(video) for video in videos)
+    assert fetcher.feed_validators[bbc["id"]]["etag"] == '"1"'
+
+def test_persist_stage_failure_discards_validators(fetcher, monkeypatch):
+    bbc = channel("bbc")
+    videos = asyncio.run(fetcher._parse_stage([(bbc, channel_feed("bbc", entries=3))]))[0]
+    fetcher._pending_validators[bbc["id"]] = {"etag": '"1"', "last_modified": None, "content_hash": "1"}
+
+    async def fail(videos):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(fetcher, "_save_videos", fail)
+    with pytest.raises(RuntimeError):
+        asyncio.run(fetcher._persist_stage([videos]))
+
+    assert bbc["id"] not in fetcher.feed_validators
+    assert bbc["id"] not in fetcher._pending_validators
+    assert not any(fetcher.seen_index.is_known(video) for video in videos)
+
+def test_fetcher_pipeline_ingests_every_healthy_channel(fetcher, monkeypatch):
+    channels = [channel("bbc"), channel("broken"), channel("cnn", category="politics")]
+    serve(monkeypatch, {
+        channels[0]["rss_url"]: channel_feed("bbc", entries=4),
+        channels[2]["rss_url"]: channel_feed("cnn", entries=3)
+    })
+
+    async def cycle():
+        await fetcher._fetch_all_channels(channels)
+        await fetcher.pipeline.stop()
+
+    asyncio.run(cycle())
+
+    assert len(fetcher.saved) == 7
+    assert sorted(fetcher.websocket_manager.broadcasts) == sorted(video["id"] for video in fetcher.saved)
+    assert fetcher.last_cycle_stats["new_videos"] == 7
+    assert fetcher.last_cycle_stats["failed_channels"] == 1
+    assert set(fetcher.feed_validators) == {channels[0]["id"], channels[2]["id"]}
+
+def test_pipeline_runs_stages_in_order():
+    trace = []
+
+    def stage(name):
+        async def handler(items):
+            trace.extend((name, item) for item in items)
+            return items
+        return PipelineStage(name, handler)
+
+    async def run():
+        pipeline = IngestionPipeline([stage("fetch"), stage("parse"), stage("persist")])
+        await pipeline.run([1, 2, 3])
+        await pipeline.stop()
+
+    asyncio.run(run())
+
+    for item in (1, 2, 3):
+        assert [name for name, traced in trace if traced == item] == ["fetch", "parse", "persist"]
+
+def test_pipeline_isolates_item_errors():
+    persisted = []
+
+    async def parse(items):
+        if items == ["bad"]:
+            raise ValueError("unparseable")
+        return items
+
+    async def persist(items):
+        persisted.extend(items)
+
+    async def run():
+        pipeline = IngestionPipeline([PipelineStage("parse", parse), PipelineStage("persist", persist)])
+        await pipeline.run(["a", "bad", "b"])
+        await pipeline.stop()
+        return pipeline
+
+    pipeline = asyncio.run(run())
+
+    assert sorted(persisted) == ["a", "b"]
+    stats = pipeline.get_stats()
+    assert stats["parse"]["errors"] == 1
+    assert stats["parse"]["processed"] == 3
+    assert stats["persist"]["errors"] == 0
+
+def test_pipeline_bounds_queues_with_backpressure():
+    queue_size = 2
+    depths = []
+
+    async def fetch(items):
+        return items
+
+    async def persist(items):
+        depths.append(slow.queue.qsize())
+        await asyncio.sleep(0.01)
+
+    slow = PipelineStage("persist", persist, queue_size=queue_size)
+    fast = PipelineStage("fetch", fetch, concurrency=4, queue_size=queue_size)
+
+    async def run():
+        pipeline = IngestionPipeline([fast, slow])
+        await pipeline.run(list(range(20)))
+        await pipeline.stop()
+
+    asyncio.run(run())
+
+    assert slow.processed == 20
+    assert max(depths) <= queue_size
+    # The fast stage waited on the slow one instead of buffering ahead of it
+    assert fast.blocked_seconds > 0
+
+def test_stopping_mid_run_releases_the_pending_run():
+    started = []
+
+    async def fetch(items):
+        started.extend(items)
+        await asyncio.sleep(3600)
+
+    async def persist(items):
+        return items
+
+    fetch_stage = PipelineStage("fetch", fetch, queue_size=2)
+
+    async def run():
+        pipeline = IngestionPipeline([fetch_stage, PipelineStage("persist", persist)])
+        pending = asyncio.create_task(pipeline.run(list(range(10))))
+        while not started:
+            await asyncio.sleep(0)
+        await pipeline.stop()
+        await asyncio.wait_for(pending, timeout=1)
+
+    asyncio.run(run())
+
+    assert started == [0]
+    # The in-flight item was cancelled; everything still queued was dropped
+    assert fetch_stage.processed == 1
+    assert fetch_stage.dropped >= 1
+    assert fetch_stage.queue.qsize() == 0
+
+def test_scheduler_requeues_channels_whose_poll_failed(fetcher, monkeypatch):
+    bbc, cnn = channel("bbc"), channel("cnn")
+    fetcher.poll_channels = [bbc, cnn]
+    fetcher.adaptive_scheduling = True
+
+    async def fail_after_bbc(channels):
+        fetcher._reschedule(bbc, [])
+        fetcher.running = False
+        raise RuntimeError("pipeline crashed")
+
+    monkeypatch.setattr(fetcher, "_fetch_all_channels", fail_after_bbc)
+    sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda seconds: sleep(0))
+    fetcher.running = True
+    asyncio.run(fetcher._run_scheduled_fetching())
+
+    schedule = fetcher.scheduler.get_stats()
+    # bbc got its next poll time; cnn is due again instead of dropped
+    assert schedule[bbc["id"]]["due_in"] > 0
+    assert fetcher.scheduler.pop_due() == [cnn["id"]]
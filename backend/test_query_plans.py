@@ -0,0 +1,78 @@
+"""
+Query-plan regression tests for the video list, count and search queries
+
+Seeds a throwaway SQLite database, applies the migrations and runs
+EXPLAIN QUERY PLAN on every query the API issues. None of them may fall back
+to a full table scan or a temporary sort.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from fixture_data import seed_videos
+from migrations import run_migrations
+from video_queries import (
+    video_list_query, live_videos_query, search_videos_query, category_videos_query, after_position
+)
+
+SEEDED_VIDEOS = 5000
+
+QUERIES = {
+    "videos": lambda db: video_list_query(db).offset(40).limit(20),
+    "videos?category": lambda db: video_list_query(db, category="technology").limit(20),
+    "videos?cursor": lambda db: after_position(video_list_query(db), POSITION).limit(21),
+    "videos?category&cursor": lambda db: after_position(video_list_query(db, category="technology"), POSITION).limit(21),
+    "videos?channel": lambda db: video_list_query(db, channel="channel07").limit(20),
+    "videos?is_live": lambda db: video_list_query(db, is_live=True).limit(20),
+    "videos?search": lambda db: video_list_query(db, search="storm").limit(20),
+    "videos?category&search": lambda db: video_list_query(db, category="world", search="clim").limit(20),
+    "videos?channel&search": lambda db: video_list_query(db, channel="channel07", search="storm").limit(20),
+    "videos?min_duration&search": lambda db: video_list_query(db, min_duration=600, search="storm").limit(20),
+    "videos?min_duration&max_duration": lambda db: video_list_query(db, min_duration=60, max_duration=90).limit(20),
+    "videos?min_duration&max_duration (wide)": lambda db: video_list_query(db, min_duration=600, max_duration=3599).limit(20),
+    "videos?category&min_duration&max_duration": lambda db: video_list_query(db, category="world", min_duration=60, max_duration=90).limit(20),
+    "videos?max_duration": lambda db: video_list_query(db, max_duration=3000).limit(20),
+    "videos?category&is_live": lambda db: video_list_query(db, category="world", is_live=False).limit(20),
+    "videos?category (count)": lambda db: video_list_query(db, category="technology").order_by(None).with_entities(text("count(*)")),
+    "live": lambda db: live_videos_query(db),
+    "search": lambda db: search_videos_query(db, "summit").limit(20),
+    "search?max_duration": lambda db: search_videos_query(db, "summit", max_duration=300).limit(20),
+    "category": lambda db: category_videos_query(db, "science").limit(20),
+}
+
+POSITION = {"published": datetime.utcnow(), "id": "yt:video:bench00001000"}
+
+def plan_problems(plan_rows) -> list:
+    """Return the plan steps that scan without an index or sort in a temp b-tree"""
+    problems = []
+    for row in plan_rows:
+        detail = row[-1]
+        if "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+        elif not detail.startswith(("SCAN", "SEARCH")) or detail.split()[1].startswith("anon_"):
+            # Not a table access, or a read of a subquery's own result
+            continue
+        elif "USING" not in detail and "VIRTUAL TABLE INDEX" not in detail:
+            problems.append(detail)
+    return problems
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    seed_videos(engine, SEEDED_VIDEOS)
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.mark.parametrize("name", QUERIES)
+def test_query_uses_an_index(engine, name):
+    with Session(bind=engine) as db:
+        query = QUERIES[name](db)
+        sql = str(query.statement.compile(engine, compile_kwargs={"literal_binds": True}))
+        plan = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+
+    problems = plan_problems(plan)
+    assert not problems, f"{name}: {' | '.join(row[-1] for row in plan)}"
@@ -9,6 +9,9 @@ from urllib.parse import urlparse, parse_qs
 import re
 from dotenv import load_dotenv
 
+from http_client import get_http_client
+from video_time import format_duration, parse_duration
+
 # Load environment variables
 load_dotenv()
 
@@ -41,54 +44,54 @@ class VideoAPIs:
             search_terms = category_mapping.get(category, [category])
             all_videos = []
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                for term in search_terms[:3]:  # Use first 3 terms to avoid rate limits
-                    try:
-                        # Search for recent videos
-                        search_url = "https://www.googleapis.com/youtube/v3/search"
-                        params = {
-                            'part': 'snippet',
-                            'q': term,
-                            'type': 'video',
-                            'order': 'date',
-                            'maxResults': min(max_results, 10),
-                            'key': self.youtube_api_key,
-                            'publishedAfter': (datetime.now() - timedelta(days=7)).isoformat() + 'Z'
-                        }
-                        
-                        response = await client.get(search_url, params=params)
-                        response.raise_for_status()
-                        
-                        data = response.json()
-                        
-                        if 'items' in data:
-                            # Get video details for each found video
-                            video_ids = [item['id']['videoId'] for item in data['items']]
-                            videos_detail = await self._get_youtube_video_details(client, video_ids)
-                            
-                            for item, video_detail in zip(data['items'], videos_detail):
-                                if video_detail:
-                                    video_data = {
-                                        'id': f"yt:video:{item['id']['videoId']}",
-                                        'title': item['snippet']['title'],
-                                        'channel_id': item['snippet']['channelId'],
-                                        'channel_name': item['snippet']['channelTitle'],
-                                        'published': datetime.fromisoformat(item['snippet']['publishedAt'].replace('Z', '+00:00')),
-                                        'url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
-                                        'embed_url': f"https://www.youtube.com/embed/{item['id']['videoId']}",
-                                        'thumbnail': item['snippet']['thumbnails']['high']['url'],
-                                        'category': category,
-                                        'is_live': False,  # Search API doesn't return live status
-                                        'duration': video_detail.get('duration', ''),
-                                        'view_count': video_detail.get('view_count', 0),
-                                        'description': item['snippet']['description']
-                                    }
-                                    all_videos.append(video_data)
+            client = get_http_client()
+            for term in search_terms[:3]:  # Use first 3 terms to avoid rate limits
+                try:
+                    # Search for recent videos
+                    search_url = "https://www.googleapis.com/youtube/v3/search"
+                    params = {
+                        'part': 'snippet',
+                        'q': term,
+                        'type': 'video',
+                        'order': 'date',
+                        'maxResults': min(max_results, 10),
+                        'key': self.youtube_api_key,
+                        'publishedAfter': (datetime.now() - timedelta(days=7)).isoformat() + 'Z'
+                    }
                     
-                    except Exception as e:
-                        logger.error(f"Error fetching YouTube videos for term '{term}': {e}")
-                        continue
+                    response = await client.get(search_url, params=params)
+                    response.raise_for_status()
+                    
+                    data = response.json()
+                    
+                    if 'items' in data:
+                        # Get video details for each found video
+                        video_ids = [item['id']['videoId'] for item in data['items']]
+                        videos_detail = await self._get_youtube_video_details(client, video_ids)
                         
+                        for item, video_detail in zip(data['items'], videos_detail):
+                            if video_detail:
+                                video_data = {
+                                    'id': f"yt:video:{item['id']['videoId']}",
+                                    'title': item['snippet']['title'],
+                                    'channel_id': item['snippet']['channelId'],
+                                    'channel_name': item['snippet']['channelTitle'],
+                                    'published': datetime.fromisoformat(item['snippet']['publishedAt'].replace('Z', '+00:00')),
+                                    'url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
+                                    'embed_url': f"https://www.youtube.com/embed/{item['id']['videoId']}",
+                                    'thumbnail': item['snippet']['thumbnails']['high']['url'],
+                                    'category': category,
+                                    'is_live': False,  # Search API doesn't return live status
+                                    'duration': video_detail.get('duration', ''),
+                                    'view_count': video_detail.get('view_count', 0),
+                                    'description': item['snippet']['description']
+                                }
+                                all_videos.append(video_data)
+                
+                except Exception as e:
+                    logger.error(f"Error fetching YouTube videos for term '{term}': {e}")
+                    continue
+                    
             return all_videos[:max_results]
             
         except Exception as e:
@@ -122,7 +125,7 @@ class VideoAPIs:
                     if 'items' in data:
                         for item in data['items']:
                             details = {
-                                'duration': self._parse_youtube_duration(item['contentDetails']['duration']),
+                                'duration': format_duration(parse_duration(item['contentDetails']['duration'])),
                                 'view_count': int(item['statistics'].get('viewCount', 0))
                             }
                             all_details.append(details)
@@ -140,38 +143,6 @@ class VideoAPIs:
             logger.error(f"Error in video details fetch: {e}")
             return [{} for _ in video_ids]
     
-    def _parse_youtube_duration(self, duration: str) -> str:
-        """Parse YouTube ISO 8601 duration to readable format"""
-        if not duration:
-            return ""
-        
-        # Remove PT prefix and parse
-        duration = duration.replace('PT', '')
-        
-        hours = 0
-        minutes = 0
-        seconds = 0
-        
-        # Extract hours
-        if 'H' in duration:
-            hours = int(duration.split('H')[0])
-            duration = duration.split('H')[1]
-        
-        # Extract minutes
-        if 'M' in duration:
-            minutes = int(duration.split('M')[0])
-            duration = duration.split('M')[1]
-        
-        # Extract seconds
-        if 'S' in duration:
-            seconds = int(duration.split('S')[0])
-        
-        # Format output
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{seconds:02d}"
-        else:
-            return f"{minutes}:{seconds:02d}"
-    
     async def fetch_vimeo_videos(self, category: str, max_results: int = 20) -> List[Dict]:
         """Fetch videos from Vimeo API for specific category"""
         if not self.vimeo_access_token:
@@ -194,72 +165,58 @@ class VideoAPIs:
             search_terms = category_mapping.get(category, [category])
             all_videos = []
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                headers = {
-                    'Authorization': f'Bearer {self.vimeo_access_token}',
-                    'Content-Type': 'application/json'
-                }
+            client = get_http_client()
+            headers = {
+                'Authorization': f'Bearer {self.vimeo_access_token}',
+                'Content-Type': 'application/json'
+            }
+            
+            for term in search_terms[:2]:  # Use first 2 terms
+                try:
+                    url = "https://api.vimeo.com/videos"
+                    params = {
+                        'query': term,
+                        'per_page': min(max_results, 10),
+                        'sort': 'date',
+                        'filter': 'duration',
+                        'filter_min': 60,  # Minimum 1 minute
+                        'filter_max': 3600  # Maximum 1 hour
+                    }
+                    
+                    response = await client.get(url, params=params, headers=headers)
+                    response.raise_for_status()
+                    
+                    data = response.json()
+                    
+                    if 'data' in data:
+                        for item in data['data']:
+                            video_data = {
+                                'id': f"vimeo:video:{item['uri'].split('/')[-1]}",
+                                'title': item['name'],
+                                'channel_id': item['user']['uri'].split('/')[-1],
+                                'channel_name': item['user']['name'],
+                                'published': datetime.fromisoformat(item['created_time'].replace('Z', '+00:00')),
+                                'url': item['link'],
+                                'embed_url': item['player_embed_url'],
+                                'thumbnail': item['pictures']['sizes'][-1]['link'],
+                                'category': category,
+                                'is_live': False,
+                                'duration': format_duration(parse_duration(item['duration'])),
+                                'view_count': item.get('stats', {}).get('plays', 0),
+                                'description': item.get('description', '')
+                            }
+                            all_videos.append(video_data)
                 
-                for term in search_terms[:2]:  # Use first 2 terms
-                    try:
-                        url = "https://api.vimeo.com/videos"
-                        params = {
-                            'query': term,
-                            'per_page': min(max_results, 10),
-                            'sort': 'date',
-                            'filter': 'duration',
-                            'filter_min': 60,  # Minimum 1 minute
-                            'filter_max': 3600  # Maximum 1 hour
-                        }
-                        
-                        response = await client.get(url, params=params, headers=headers)
-                        response.raise_for_status()
-                        
-                        data = response.json()
-                        
-                        if 'data' in data:
-                            for item in data['data']:
-                                video_data = {
-                                    'id': f"vimeo:video:{item['uri'].split('/')[-1]}",
-                                    'title': item['name'],
-                                    'channel_id': item['user']['uri'].split('/')[-1],
-                                    'channel_name': item['user']['name'],
-                                    'published': datetime.fromisoformat(item['created_time'].replace('Z', '+00:00')),
-                                    'url': item['link'],
-                                    'embed_url': item['player_embed_url'],
-                                    'thumbnail': item['pictures']['sizes'][-1]['link'],
-                                    'category': category,
-                                    'is_live': False,
-                                    'duration': self._format_vimeo_duration(item['duration']),
-                                    'view_count': item.get('stats', {}).get('plays', 0),
-                                    'description': item.get('description', '')
-                                }
-                                all_videos.append(video_data)
+                except Exception as e:
+                    logger.error(f"Error fetching Vimeo videos for term '{term}': {e}")
+                    continue
                     
-                    except Exception as e:
-                        logger.error(f"Error fetching Vimeo videos for term '{term}': {e}")
-                        continue
-                        
             return all_videos[:max_results]
             
         except Exception as e:
             logger.error(f"Error in Vimeo API fetch: {e}")
             return []
     
-    def _format_vimeo_duration(self, seconds: int) -> str:
-        """Format Vimeo duration from seconds to readable format"""
-        if not seconds:
-            return ""
-        
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
-        
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{secs:02d}"
-        else:
-            return f"{minutes}:{secs:02d}"
-    
     async def fetch_demo_videos(self, category: str, max_results: int = 20) -> List[Dict]:
         """Fetch demo videos for categories that don't have enough content"""
         # This is a fallback method that returns demo videos
@@ -0,0 +1,116 @@
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Query, load_only
+
+from json_response import dumps
+from models import Video
+from video_time import epoch_ms, parse_duration
+
+VIDEO_FRAGMENT_CACHE_SIZE = int(os.getenv("VIDEO_FRAGMENT_CACHE_SIZE", "20000"))
+
+# API field -> the Video columns it is built from
+VIDEO_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "id": ("id",),
+    "title": ("title",),
+    "channel": ("channel_id", "channel_name"),
+    "published": ("published_ms",),
+    "url": ("url",),
+    "embedUrl": ("embed_url",),
+    "thumbnail": ("thumbnail",),
+    "category": ("category",),
+    "isLive": ("is_live",),
+    "duration": ("duration",),
+    "durationSeconds": ("duration_seconds",),
+    "viewCount": ("view_count",),
+    "description": ("description",),
+}
+
+ALL_FIELDS = tuple(VIDEO_FIELDS)
+# What a video card renders; lists leave the description Text to the watch page
+LIST_FIELDS = tuple(field for field in ALL_FIELDS if field != "description")
+
+def parse_fields(fields: Optional[str], default: Sequence[str] = LIST_FIELDS) -> Tuple[str, ...]:
+    """Parse a ?fields=title,thumbnail sparse fieldset; raises ValueError on unknown names.
+
+    id is always included so clients can key and link results.
+    """
+    if not fields:
+        return tuple(default)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in VIDEO_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(field for field in ALL_FIELDS if field == "id" or field in requested)
+
+def load_fields(query: Query, fields: Sequence[str]) -> Query:
+    """Load only the columns fields need, plus the keyset cursor and fragment cache columns"""
+    columns = {"id", "published", "updated_at"}
+    for field in fields:
+        columns.update(VIDEO_FIELDS[field])
+    return query.options(load_only(*(getattr(Video, name) for name in sorted(columns))))
+
+def video_to_dict(video: Video, fields: Sequence[str] = ALL_FIELDS) -> Dict[str, Any]:
+    """API representation of a stored video, limited to fields"""
+    data = {}
+    for field in fields:
+        if field == "channel":
+            data["channel"] = {"id": video.channel_id, "name": video.channel_name}
+        elif field == "published":
+            # Rows written before published_ms existed only have published
+            data["published"] = video.published_ms or epoch_ms(video.published)
+        else:
+            data[field] = getattr(video, VIDEO_FIELDS[field][0])
+    return data
+
+def video_data_to_dict(video: Dict[str, Any], fields: Sequence[str] = ALL_FIELDS) -> Dict[str, Any]:
+    """API representation of a video dict from ingestion or video_apis, limited to fields"""
+    data = {}
+    for field in fields:
+        if field == "channel":
+            data["channel"] = {"id": video["channel_id"], "name": video["channel_name"]}
+        elif field == "published":
+            data["published"] = video.get("published_ms") or epoch_ms(video["published"])
+        elif field == "durationSeconds":
+            data["durationSeconds"] = video.get("duration_seconds") or parse_duration(video["duration"])
+        elif field == "viewCount":
+            data["viewCount"] = video.get("view_count", 0)
+        else:
+            data[field] = video[VIDEO_FIELDS[field][0]]
+    return data
+
+class VideoFragmentCache:
+    """Encoded JSON per (video, fieldset), so list pages are built by joining bytes.
+
+    Keyed on updated_at, which ingestion bumps whenever a video's metadata
+    changes, so a stale fragment is never served. Least recently used
+    fragments are dropped beyond max_entries. Only used from the event loop.
+    """
+
+    def __init__(self, max_entries: int = VIDEO_FRAGMENT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._fragments: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, video: Video, fields: Sequence[str] = ALL_FIELDS) -> bytes:
+        """video_to_dict(video, fields) as JSON bytes"""
+        key = (video.id, video.updated_at, tuple(fields))
+        fragment = self._fragments.get(key)
+        if fragment is not None:
+            self._fragments.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+        self.misses += 1
+        fragment = dumps(video_to_dict(video, fields))
+        self._fragments[key] = fragment
+        if len(self._fragments) > self.max_entries:
+            self._fragments.popitem(last=False)
+        return fragment
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"entries": len(self._fragments), "hits": self.hits, "misses": self.misses}
+
+video_fragments = VideoFragmentCache()
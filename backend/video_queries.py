@@ -0,0 +1,236 @@
+import base64
+import json
+import os
+import re
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import column, false, func, literal_column, null, select, table, tuple_
+from sqlalchemy.orm import Query, Session
+
+from database import IS_SQLITE
+from models import Video, VideoCount
+
+# Query shapes behind the list endpoints in main.py. They live here so the
+# query-plan tests (test_query_plans.py) explain exactly what the API runs.
+
+# SQLite searches the videos_fts index (migration 2); other databases use ILIKE
+FULL_TEXT_SEARCH = IS_SQLITE
+
+SEARCH_SNIPPET_TOKENS = 16
+# Only the newest this-many matches are ranked, so a very common word costs
+# no more than a rare one
+SEARCH_CANDIDATES = int(os.getenv("SEARCH_CANDIDATES", "2000"))
+_SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
+_videos_fts = table("videos_fts", column("rowid"), column("rank"))
+
+def fts_match_expression(q: str, columns: Sequence[str] = ()) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, as a prefix.
+
+    Words are quoted so user input can't inject FTS5 operators. Returns None
+    when q has no searchable words.
+    """
+    terms = [f'"{term}"*' for term in _SEARCH_TERM.findall(q)]
+    if not terms:
+        return None
+    expression = " ".join(terms)
+    if columns:
+        expression = f"{{{' '.join(columns)}}} : ({expression})"
+    return expression
+
+def _full_text_filter(query: Query, q: str, columns: Sequence[str] = (), filters: Sequence = ()) -> Query:
+    """Restrict query to the newest FTS matches for q that pass filters, best BM25 rank first.
+
+    filters must be the query's own non-search criteria: the candidates are
+    picked after them, so a filtered search never loses older matches to
+    newer ones it filters out.
+    """
+    query = query.join(_videos_fts, _videos_fts.c.rowid == literal_column("videos.rowid"))
+    expression = fts_match_expression(q, columns)
+    if expression is None:
+        return query.filter(false())
+    match = literal_column("videos_fts").op("MATCH")(expression)
+    # Rowids grow with ingestion, so a rowid floor keeps the newest matches and
+    # FTS5 applies it while walking the index
+    candidates = select(_videos_fts.c.rowid).where(match)
+    if filters:
+        candidates = candidates.join(
+            Video.__table__, literal_column("videos.rowid") == _videos_fts.c.rowid
+        ).where(*filters)
+    newest = candidates.order_by(
+        _videos_fts.c.rowid.desc()
+    ).limit(SEARCH_CANDIDATES).correlate(None).subquery()
+    floor = select(func.min(newest.c.rowid)).scalar_subquery()
+    return query.filter(match, _videos_fts.c.rowid >= floor).order_by(_videos_fts.c.rank)
+
+def search_total_is_capped(total: int) -> bool:
+    """Whether a full-text search count may be short: only SEARCH_CANDIDATES matches are ranked"""
+    return FULL_TEXT_SEARCH and total >= SEARCH_CANDIDATES
+
+def video_list_query(
+    db: Session,
+    category: Optional[str] = None,
+    channel: Optional[str] = None,
+    is_live: Optional[bool] = None,
+    search: Optional[str] = None,
+    min_duration: Optional[int] = None,
+    max_duration: Optional[int] = None
+) -> Query:
+    """Videos matching the /api/videos filters, newest first"""
+    filters = duration_filters(min_duration, max_duration)
+
+    if category and category != "all":
+        filters.append(Video.category == category)
+
+    if channel:
+        filters.append(Video.channel_id == channel)
+
+    if is_live is not None:
+        filters.append(Video.is_live == is_live)
+
+    query = db.query(Video).filter(*filters)
+
+    if search and FULL_TEXT_SEARCH:
+        # Most relevant first; FTS5 yields rows in rank order, so no sort step
+        return _full_text_filter(query, search, ("title", "description"), filters)
+
+    if search:
+        search_term = f"%{search}%"
+        query = query.filter(
+            (Video.title.ilike(search_term)) |
+            (Video.description.ilike(search_term))
+        )
+
+    # Order by published date (newest first); id keeps the order total
+    return query.order_by(Video.published.desc(), Video.id.desc())
+
+def duration_filters(min_duration: Optional[int] = None, max_duration: Optional[int] = None) -> list:
+    """Criteria for videos whose duration_seconds falls in the range (inclusive)"""
+    filters = []
+    if min_duration is not None:
+        filters.append(Video.duration_seconds >= min_duration)
+    if max_duration is not None:
+        filters.append(Video.duration_seconds <= max_duration)
+    return filters
+
+def with_duration_range(query: Query, min_duration: Optional[int] = None, max_duration: Optional[int] = None) -> Query:
+    """Restrict query to videos whose duration_seconds falls in the range (inclusive)"""
+    return query.filter(*duration_filters(min_duration, max_duration))
+
+def encode_cursor(position: dict) -> str:
+    """Opaque page cursor for a position dict"""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str) -> dict:
+    """Validated position from encode_cursor; raises ValueError if it isn't one.
+
+    Returns {"offset": n} or {"published": datetime, "id": str}.
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if "offset" in position:
+            offset = int(position["offset"])
+            if offset < 0:
+                raise ValueError("negative offset")
+            return {"offset": offset}
+        return {
+            "published": datetime.fromisoformat(position["published"]),
+            "id": str(position["id"])
+        }
+    except Exception as e:
+        raise ValueError(f"Malformed cursor: {e}")
+
+def keyset_position(video: Video) -> dict:
+    """Cursor position just after video in newest-first order"""
+    return {"published": video.published.isoformat(), "id": video.id}
+
+def after_position(query: Query, position: dict) -> Query:
+    """Videos strictly after a decoded keyset position in (published, id) DESC order.
+
+    Seeking on the key instead of skipping rows keeps deep pages as cheap as
+    the first, and videos ingested meanwhile can't shift the page boundary.
+    """
+    return query.filter(
+        tuple_(Video.published, Video.id) < tuple_(position["published"], position["id"])
+    )
+
+def maintained_total(
+    db: Session,
+    category: Optional[str] = None,
+    channel: Optional[str] = None,
+    is_live: Optional[bool] = None
+) -> Optional[int]:
+    """Total for a /api/videos filter read from video_counts.
+
+    Covers no filter or a single category, channel or live filter; returns None
+    when the filters combine and need a real COUNT.
+    """
+    facets = []
+    if category and category != "all":
+        facets.append(("category", category))
+    if channel:
+        facets.append(("channel", channel))
+    if is_live is not None:
+        facets.append(("is_live", "true" if is_live else "false"))
+    if len(facets) > 1:
+        return None
+
+    dimension, value = facets[0] if facets else ("all", "")
+    count = db.query(VideoCount.count).filter(
+        VideoCount.dimension == dimension, VideoCount.value == value
+    ).scalar()
+    return count or 0
+
+def facet_counts(db: Session) -> dict:
+    """All maintained counts as {"total", "categories", "channels", "live"}"""
+    facets = {"total": 0, "categories": {}, "channels": {}, "live": {"live": 0, "notLive": 0}}
+    for dimension, value, count in db.query(VideoCount.dimension, VideoCount.value, VideoCount.count):
+        if not count:
+            continue
+        if dimension == "all":
+            facets["total"] = count
+        elif dimension == "category":
+            facets["categories"][value] = count
+        elif dimension == "channel":
+            facets["channels"][value] = count
+        elif dimension == "is_live":
+            facets["live"]["live" if value == "true" else "notLive"] = count
+    return facets
+
+def live_videos_query(db: Session) -> Query:
+    """Currently live videos, newest first"""
+    return db.query(Video).filter(Video.is_live == True).order_by(Video.published.desc())
+
+def search_videos_query(
+    db: Session,
+    q: str,
+    min_duration: Optional[int] = None,
+    max_duration: Optional[int] = None
+) -> Query:
+    """(video, highlighted title, description snippet) rows matching q.
+
+    With full-text search the rows come back by relevance and the highlights
+    wrap matched words in <mark>; the ILIKE fallback is newest first with no
+    highlights.
+    """
+    if FULL_TEXT_SEARCH:
+        query = db.query(
+            Video,
+            literal_column("highlight(videos_fts, 0, '<mark>', '</mark>')"),
+            literal_column(f"snippet(videos_fts, 1, '<mark>', '</mark>', '…', {SEARCH_SNIPPET_TOKENS})")
+        )
+        filters = duration_filters(min_duration, max_duration)
+        return _full_text_filter(query.filter(*filters), q, filters=filters)
+
+    search_term = f"%{q}%"
+    query = with_duration_range(db.query(Video, null(), null()), min_duration, max_duration)
+    return query.filter(
+        (Video.title.ilike(search_term)) |
+        (Video.description.ilike(search_term)) |
+        (Video.channel_name.ilike(search_term))
+    ).order_by(Video.published.desc())
+
+def category_videos_query(db: Session, category: str) -> Query:
+    """Videos in one category, newest first"""
+    return db.query(Video).filter(Video.category == category).order_by(Video.published.desc())
@@ -0,0 +1,244 @@
+import logging
+from datetime import datetime
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, insert, select
+
+from database import SessionLocal, engine
+from models import DatasetVersion, Video, VideoCount
+from dataset_version import dataset_versions, read_dataset_versions
+from hot_index import hot_index
+from response_cache import response_cache
+from video_time import epoch_ms, parse_duration
+
+logger = logging.getLogger(__name__)
+
+# Columns written for every ingested video
+VIDEO_FIELDS = (
+    'id', 'title', 'channel_id', 'channel_name', 'published', 'published_ms', 'url', 'embed_url',
+    'thumbnail', 'category', 'is_live', 'duration', 'duration_seconds', 'view_count', 'description'
+)
+
+# Metadata that may change after a video is first stored
+UPSERT_FIELDS = ('title', 'is_live', 'duration', 'duration_seconds', 'description', 'thumbnail')
+
+def video_fingerprint(video_data: Dict) -> int:
+    """Hash of a video's mutable metadata, used to detect changes without a query"""
+    return hash(tuple(video_data.get(field) for field in UPSERT_FIELDS))
+
+def get_dialect_insert():
+    """Get an INSERT construct that supports ON CONFLICT for the current database"""
+    if engine.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+        return postgresql_insert
+    return None
+
+def _live_value(is_live) -> str:
+    return "true" if is_live else "false"
+
+def count_deltas(videos: Iterable[Dict], sign: int = 1) -> Counter:
+    """video_counts changes for adding (sign=1) or removing (sign=-1) videos"""
+    deltas = Counter()
+    for video_data in videos:
+        deltas[("all", "")] += sign
+        deltas[("category", video_data['category'])] += sign
+        deltas[("channel", video_data['channel_id'])] += sign
+        deltas[("is_live", _live_value(video_data.get('is_live')))] += sign
+    return deltas
+
+def apply_count_deltas(db, deltas: Dict[Tuple[str, str], int]):
+    """Add deltas to video_counts in the caller's transaction"""
+    rows = [
+        {'dimension': dimension, 'value': value, 'count': delta}
+        for (dimension, value), delta in deltas.items() if delta
+    ]
+    if not rows:
+        return
+
+    dialect_insert = get_dialect_insert()
+    if dialect_insert is not None:
+        stmt = dialect_insert(VideoCount).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[VideoCount.dimension, VideoCount.value],
+            set_={'count': VideoCount.count + stmt.excluded.count}
+        )
+        db.execute(stmt)
+        return
+
+    for row in rows:
+        updated = db.execute(
+            VideoCount.__table__.update()
+            .where(VideoCount.dimension == row['dimension'], VideoCount.value == row['value'])
+            .values(count=VideoCount.count + row['count'])
+        )
+        if updated.rowcount == 0:
+            db.execute(insert(VideoCount).values(row))
+
+def video_datasets(categories: Iterable[str]) -> List[str]:
+    """Dataset versions to bump when videos in these categories change"""
+    return ["videos"] + sorted(f"videos:{category}" for category in set(categories))
+
+def bump_dataset_versions(db, names: Iterable[str]):
+    """Increment dataset versions in the caller's transaction.
+
+    New versions start at the current time in milliseconds, so a recreated
+    database never hands out an ETag a client may still hold. Call
+    dataset_versions.invalidate() after committing.
+    """
+    rows = [{'name': name, 'version': epoch_ms(datetime.utcnow())} for name in names]
+    if not rows:
+        return
+
+    dialect_insert = get_dialect_insert()
+    if dialect_insert is not None:
+        stmt = dialect_insert(DatasetVersion).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DatasetVersion.name],
+            set_={'version': DatasetVersion.version + 1}
+        )
+        db.execute(stmt)
+        return
+
+    for row in rows:
+        updated = db.execute(
+            DatasetVersion.__table__.update()
+            .where(DatasetVersion.name == row['name'])
+            .values(version=DatasetVersion.version + 1)
+        )
+        if updated.rowcount == 0:
+            db.execute(insert(DatasetVersion).values(row))
+
+def rebuild_video_counts(db):
+    """Recount video_counts from the videos table, in the caller's transaction"""
+    rows = [{'dimension': "all", 'value': "", 'count': db.execute(select(func.count()).select_from(Video)).scalar()}]
+    for dimension, column in (("category", Video.category), ("channel", Video.channel_id), ("is_live", Video.is_live)):
+        for value, count in db.execute(select(column, func.count()).group_by(column)):
+            rows.append({
+                'dimension': dimension,
+                'value': _live_value(value) if dimension == "is_live" else value,
+                'count': count
+            })
+
+    db.execute(delete(VideoCount))
+    db.execute(insert(VideoCount), rows)
+
+def video_row(video_data: Dict, now: datetime) -> Dict:
+    """Column values for a video dict, filling the derived published_ms and duration_seconds"""
+    row = {field: video_data.get(field) for field in VIDEO_FIELDS}
+    row['is_live'] = bool(row['is_live'])
+    # Derived columns, for callers that only supply published and duration
+    if row['published_ms'] is None:
+        row['published_ms'] = epoch_ms(row['published'])
+    if row['duration_seconds'] is None:
+        row['duration_seconds'] = parse_duration(row['duration'])
+    row['created_at'] = now
+    row['updated_at'] = now
+    return row
+
+def _has_changed(video_data: Dict, existing) -> bool:
+    return any(
+        field in video_data and video_data[field] != getattr(existing, field)
+        for field in UPSERT_FIELDS
+    )
+
+def upsert_videos(videos: List[Dict]) -> List[Dict]:
+    """Persist a batch of videos in one transaction.
+
+    Existing IDs are resolved with a single IN query, new videos are written with
+    one multi-row INSERT and existing videos whose metadata changed (live flag,
+    title, ...) are upserted. Returns the newly inserted videos; on error the
+    transaction is rolled back and the exception re-raised.
+    """
+    # Later entries for the same ID win
+    by_id = {video_data['id']: video_data for video_data in videos}
+    if not by_id:
+        return []
+
+    db = SessionLocal()
+    try:
+        existing = {
+            row.id: row
+            for row in db.query(Video.id, *(getattr(Video, field) for field in UPSERT_FIELDS))
+            .filter(Video.id.in_(list(by_id)))
+        }
+
+        new_videos = [video_data for video_id, video_data in by_id.items() if video_id not in existing]
+        changed_videos = [
+            video_data for video_id, video_data in by_id.items()
+            if video_id in existing and _has_changed(video_data, existing[video_id])
+        ]
+
+        now = datetime.utcnow()
+
+        # Keep video_counts in step with this transaction; category and channel
+        # never change on update, but the live flag does
+        deltas = count_deltas(new_videos)
+        for video_data in changed_videos:
+            was_live = _live_value(existing[video_data['id']].is_live)
+            is_live = _live_value(video_data.get('is_live'))
+            if was_live != is_live:
+                deltas[("is_live", was_live)] -= 1
+                deltas[("is_live", is_live)] += 1
+        apply_count_deltas(db, deltas)
+        changed_categories = {video_data['category'] for video_data in new_videos + changed_videos}
+        versions = {}
+        if changed_categories:
+            bump_dataset_versions(db, video_datasets(changed_categories))
+            # The versions this write commits, for the hot index buffers
+            versions = read_dataset_versions(db)
+
+        new_rows = [video_row(video_data, now) for video_data in new_videos]
+        if new_rows:
+            db.execute(insert(Video).values(new_rows))
+
+        changed_rows = [video_row(video_data, now) for video_data in changed_videos]
+        if changed_videos:
+            dialect_insert = get_dialect_insert()
+            if dialect_insert is not None:
+                stmt = dialect_insert(Video).values(changed_rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Video.id],
+                    set_={
+                        **{field: getattr(stmt.excluded, field) for field in UPSERT_FIELDS},
+                        'updated_at': now
+                    }
+                )
+                db.execute(stmt)
+            else:
+                for video_data in changed_videos:
+                    db.query(Video).filter(Video.id == video_data['id']).update({
+                        **{field: video_data[field] for field in UPSERT_FIELDS if field in video_data},
+                        'updated_at': now
+                    })
+
+        db.commit()
+        if changed_categories:
+            # Cached list pages for these categories are stale now
+            dataset_versions.invalidate()
+            response_cache.invalidate_categories(changed_categories)
+            hot_index.apply_upsert(
+                changed_categories, new_rows,
+                {
+                    row['id']: {
+                        **{field: row[field] for field in UPSERT_FIELDS if field in by_id[row['id']]},
+                        'updated_at': now
+                    }
+                    for row in changed_rows
+                },
+                deltas, versions
+            )
+
+        if new_videos or changed_videos:
+            logger.info(f"Saved {len(new_videos)} new and updated {len(changed_videos)} existing videos")
+        return new_videos
+
+    except Exception as e:
+        logger.error(f"Error saving videos: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,56 @@
+import re
+from datetime import datetime
+from typing import Optional, Union
+
+# ISO 8601 durations as YouTube and RSS feeds send them, e.g. PT1H2M3S or P1DT30M
+_ISO_DURATION = re.compile(
+    r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?"
+)
+# Durations already formatted for display, e.g. 1:02:03 or 12:45
+_CLOCK_DURATION = re.compile(r"(?:(\d+):)?(\d+):(\d{2})")
+
+def parse_duration(value: Union[str, int, float, None]) -> Optional[int]:
+    """Duration in whole seconds from ISO 8601, plain seconds or H:MM:SS.
+
+    Returns None for empty or unrecognised values.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+
+    match = _ISO_DURATION.fullmatch(value)
+    if match and value != "P" and not value.endswith("T"):
+        days, hours, minutes, seconds = match.groups()
+        return (
+            int(days or 0) * 86400
+            + int(hours or 0) * 3600
+            + int(minutes or 0) * 60
+            + int(float(seconds or 0))
+        )
+
+    match = _CLOCK_DURATION.fullmatch(value)
+    if match:
+        hours, minutes, seconds = match.groups()
+        return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+
+    return None
+
+def format_duration(seconds: Optional[int]) -> str:
+    """Display form of a duration: H:MM:SS, or M:SS under an hour"""
+    if not seconds:
+        return ""
+
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+def epoch_ms(published: datetime) -> int:
+    """Milliseconds since the epoch, as the API sends published times"""
+    return int(published.timestamp() * 1000)
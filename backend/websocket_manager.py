@@ -1,8 +1,9 @@
 from fastapi import WebSocket
 from typing import List
-import json
 import logging
 
+from json_response import dumps
+
 logger = logging.getLogger(__name__)
 
 class WebSocketManager:
@@ -21,7 +22,7 @@ class WebSocketManager:
 
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         try:
-            await websocket.send_text(json.dumps(message))
+            await websocket.send_text(dumps(message).decode())
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
             self.disconnect(websocket)
@@ -29,10 +30,12 @@ class WebSocketManager:
     async def broadcast(self, message: dict):
         """Broadcast message to all connected clients"""
         disconnected = []
+        # Encoded once, not once per client
+        text = dumps(message).decode()
         
         for connection in self.active_connections:
             try:
-                await connection.send_text(json.dumps(message))
+                await connection.send_text(text)
             except Exception as e:
                 logger.error(f"Error broadcasting message: {e}")
                 disconnected.append(connection)
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Video, VideoFilters, ApiResponse, SearchResult } from '@/types';
+import { Video, VideoFilters, ApiResponse, PaginatedResponse, SearchResult } from '@/types';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -33,15 +33,20 @@ api.interceptors.response.use(
   }
 );
 
-export const fetchVideos = async (filters: VideoFilters = {}): Promise<ApiResponse<Video[]>> => {
+export const fetchVideos = async (filters: VideoFilters = {}): Promise<PaginatedResponse<Video[]>> => {
   const params = new URLSearchParams();
   
   if (filters.category) params.append('category', filters.category);
   if (filters.channel) params.append('channel', filters.channel);
   if (filters.isLive !== undefined) params.append('is_live', filters.isLive.toString());
   if (filters.search) params.append('search', filters.search);
+  if (filters.minDuration !== undefined) params.append('min_duration', filters.minDuration.toString());
+  if (filters.maxDuration !== undefined) params.append('max_duration', filters.maxDuration.toString());
   if (filters.limit) params.append('limit', filters.limit.toString());
   if (filters.offset) params.append('offset', filters.offset.toString());
+  if (filters.cursor) params.append('cursor', filters.cursor);
+  if (filters.includeTotal !== undefined) params.append('include_total', filters.includeTotal.toString());
+  if (filters.fields?.length) params.append('fields', filters.fields.join(','));
 
   const response = await api.get(`/api/videos?${params.toString()}`);
   return response.data;
@@ -77,19 +82,15 @@ export const fetchExternalVideos = async (category: string, limit: number = 20):
   return response.data;
 };
 
-export const fetchHealthVideos = async (limit: number = 20): Promise<ApiResponse<Video[]>> => {
-  const response = await api.get(`/api/videos/health?limit=${limit}`);
+export const fetchCategoryVideos = async (category: string, limit: number = 20): Promise<ApiResponse<Video[]>> => {
+  const response = await api.get(`/api/videos/category/${category}?limit=${limit}`);
   return response.data;
 };
 
-export const fetchEntertainmentVideos = async (limit: number = 20): Promise<ApiResponse<Video[]>> => {
-  const response = await api.get(`/api/videos/entertainment?limit=${limit}`);
-  return response.data;
-};
+export const fetchHealthVideos = (limit: number = 20) => fetchCategoryVideos('health', limit);
 
-export const fetchScienceVideos = async (limit: number = 20): Promise<ApiResponse<Video[]>> => {
-  const response = await api.get(`/api/videos/science?limit=${limit}`);
-  return response.data;
-};
+export const fetchEntertainmentVideos = (limit: number = 20) => fetchCategoryVideos('entertainment', limit);
+
+export const fetchScienceVideos = (limit: number = 20) => fetchCategoryVideos('science', limit);
 
 export default api;
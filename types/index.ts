@@ -12,8 +12,13 @@ export interface Video {
   category: string;
   isLive: boolean;
   duration?: string;
+  durationSeconds?: number | null;
   viewCount?: number;
   description?: string;
+  highlight?: {
+    title: string;
+    snippet: string;
+  };
 }
 
 export interface Channel {
@@ -44,6 +49,14 @@ export interface ApiResponse<T> {
   message?: string;
 }
 
+export interface PaginatedResponse<T> extends ApiResponse<T> {
+  limit: number;
+  offset: number;
+  total?: number;
+  totalApproximate?: boolean;
+  nextCursor: string | null;
+}
+
 export interface WebSocketMessage {
   type: 'new_video' | 'update' | 'error';
   data?: Video | any;
@@ -55,6 +68,11 @@ export interface VideoFilters {
   channel?: string;
   isLive?: boolean;
   search?: string;
+  minDuration?: number;
+  maxDuration?: number;
   limit?: number;
   offset?: number;
+  cursor?: string;
+  includeTotal?: boolean;
+  fields?: string[];
 }